@@ -1,30 +1,199 @@
 """MacroFactor app management — launch, focus, close."""
 
 import logging
+import os
+import select
 import subprocess
+import threading
 import time
 
 logger = logging.getLogger("macroclaw.app")
 
 APP_NAME = "MacroFactor"
 
+# How long an is_running() answer stays valid before pgrep is consulted again.
+_RUNNING_CACHE_TTL = 1.0
+_running_cache: dict[str, tuple[float, bool]] = {}
+# Last PID seen for each app, so repeat checks are a signal-0 probe, not a fork.
+_known_pids: dict[str, int] = {}
+# Seconds an AppleScript statement may take before it is treated as hung.
+OSASCRIPT_TIMEOUT = 10.0
+
+
+class AppleScriptSession:
+    """A long-lived ``osascript -i`` process that evaluates AppleScript statements.
+
+    Spawning ``osascript`` costs tens to hundreds of milliseconds per call, so
+    one-line statements are written to a single interactive interpreter and
+    the output is read back up to a sentinel echo.  Multi-line scripts, or any
+    failure of the interpreter (including no answer within
+    ``OSASCRIPT_TIMEOUT``), fall back to a one-shot ``osascript -e``.
+    """
+
+    _SENTINEL = "--EOF--"
+    _instance: "AppleScriptSession | None" = None
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "AppleScriptSession":
+        """Return the process-wide session, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _ensure_started(self) -> bool:
+        if self._proc is not None and self._proc.poll() is None:
+            return True
+        try:
+            self._proc = subprocess.Popen(
+                ["osascript", "-i"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.debug("Could not start osascript session: %s", e)
+            self._proc = None
+            return False
+        return True
+
+    def run(self, script: str) -> str:
+        """Evaluate *script* and return its printed result (stripped)."""
+        script = script.strip()
+        if "\n" in script:
+            return _run_osascript(script)
+
+        with self._lock:
+            if not self._ensure_started():
+                return _run_osascript(script)
+            try:
+                self._proc.stdin.write(f"{script}\n\"{self._SENTINEL}\"\n".encode())
+                self._proc.stdin.flush()
+                output = self._read_until_sentinel(time.monotonic() + OSASCRIPT_TIMEOUT)
+            except (OSError, ValueError) as e:
+                logger.debug("osascript session failed (%s); falling back", e)
+                self.close()
+                return _run_osascript(script)
+
+        # Interactive mode prefixes prompts/results with ">> " and "=> ".
+        lines = output.splitlines()
+        out = [ln.strip().removeprefix(">>").strip().removeprefix("=>").strip() for ln in lines]
+        return "\n".join(ln for ln in out if ln).strip('"')
+
+    def _read_until_sentinel(self, deadline: float) -> str:
+        """Return the session's output up to the sentinel echo's line.
+
+        Reads the pipe directly with ``select`` so that a stalled interpreter
+        cannot block past *deadline*.
+
+        Raises:
+            TimeoutError: If the sentinel has not arrived by *deadline*.
+            BrokenPipeError: If the interpreter exits first.
+        """
+        fd = self._proc.stdout.fileno()
+        sentinel = self._SENTINEL.encode()
+        buf = b""
+        while sentinel not in buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("osascript session did not answer")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise BrokenPipeError("osascript session closed")
+            buf += chunk
+        head = buf[: buf.index(sentinel)]
+        return head[: head.rfind(b"\n") + 1].decode(errors="replace")
+
+    def close(self) -> None:
+        """Terminate the interpreter process, if any."""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.terminate()
+            self._proc.wait(timeout=1.0)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self._proc.kill()
+        self._proc = None
+
+
+def _run_osascript(script: str) -> str:
+    """Run *script* in a one-shot ``osascript`` process and return stdout.
+
+    Gives up after ``OSASCRIPT_TIMEOUT`` seconds, returning an empty string.
+    """
+    try:
+        result = subprocess.run(
+            ["osascript", "-e", script],
+            capture_output=True, text=True, timeout=OSASCRIPT_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("osascript timed out after %.0fs: %s", OSASCRIPT_TIMEOUT, script)
+        return ""
+    return result.stdout.strip()
+
+
+def run_applescript(script: str) -> str:
+    """Evaluate *script* through the shared :class:`AppleScriptSession`."""
+    return AppleScriptSession.get().run(script)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
 
 def is_running(app_name: str = APP_NAME) -> bool:
-    """Check if the app is currently running."""
-    result = subprocess.run(
-        ["pgrep", "-f", app_name],
-        capture_output=True, text=True,
-    )
-    return result.returncode == 0
+    """Check if the app is currently running.
+
+    Matches against full command lines, so the "Designed for iPhone" build,
+    whose process is named ``Runner`` inside ``MacroFactor.app``, is found.
+    A PID found earlier is probed directly with ``kill(pid, 0)``; ``pgrep`` is
+    only spawned when there is no live known PID.  Answers are cached for
+    ``_RUNNING_CACHE_TTL`` seconds.
+    """
+    cached = _running_cache.get(app_name)
+    if cached and time.monotonic() - cached[0] < _RUNNING_CACHE_TTL:
+        return cached[1]
+
+    pid = _known_pids.get(app_name)
+    if pid is not None and _pid_alive(pid):
+        running = True
+    else:
+        _known_pids.pop(app_name, None)
+        result = subprocess.run(
+            ["pgrep", "-nf", app_name],
+            capture_output=True, text=True,
+        )
+        running = result.returncode == 0
+        if running:
+            _known_pids[app_name] = int(result.stdout.split()[0])
+
+    _running_cache[app_name] = (time.monotonic(), running)
+    return running
 
 
 def open_app(app_name: str = APP_NAME, wait: float = 5.0) -> None:
     """Open or focus the MacroFactor app.
 
     Uses macOS `open -a` which works for both native and "Designed for iPhone" apps.
+    The launch wait is skipped when the app is already running, and an app
+    that is already frontmost is left alone.
     """
+    if is_running(app_name):
+        focus_app(app_name)
+        return
     logger.info("Opening %s...", app_name)
     subprocess.run(["open", "-a", app_name], check=True)
+    _running_cache.pop(app_name, None)
     time.sleep(wait)
     logger.info("%s is open.", app_name)
 
@@ -32,17 +201,31 @@ def open_app(app_name: str = APP_NAME, wait: float = 5.0) -> None:
 def close_app(app_name: str = APP_NAME) -> None:
     """Quit the app gracefully via AppleScript."""
     logger.info("Closing %s...", app_name)
-    subprocess.run(
-        ["osascript", "-e", f'tell application "{app_name}" to quit'],
-        capture_output=True,
-    )
+    run_applescript(f'tell application "{app_name}" to quit')
+    _running_cache.pop(app_name, None)
+    _known_pids.pop(app_name, None)
     time.sleep(1.0)
 
 
+def frontmost_app_name() -> str:
+    """Return the name of the frontmost application.
+
+    Asks AppKit directly when PyObjC's Cocoa bindings are installed, otherwise
+    System Events through the shared AppleScript session.
+    """
+    try:
+        from AppKit import NSWorkspace
+    except ImportError:
+        return run_applescript(
+            'tell application "System Events" to get name of first process whose frontmost is true'
+        )
+    app = NSWorkspace.sharedWorkspace().frontmostApplication()
+    return str(app.localizedName()) if app is not None else ""
+
+
 def focus_app(app_name: str = APP_NAME) -> None:
-    """Bring the app to the foreground via AppleScript."""
-    subprocess.run(
-        ["osascript", "-e", f'tell application "{app_name}" to activate'],
-        capture_output=True,
-    )
+    """Bring the app to the foreground via AppleScript (no-op if already frontmost)."""
+    if frontmost_app_name() == app_name:
+        return
+    run_applescript(f'tell application "{app_name}" to activate')
     time.sleep(0.5)
@@ -1,5 +1,6 @@
 """CLI commands for the automation module."""
 
+import asyncio
 import logging
 import sys
 
@@ -37,7 +38,9 @@ def daily(speed: float, download_timeout: float):
     """Replay the 'daily' export sequence and ingest the result."""
     from automation.export import run_recorded_export
 
-    result = run_recorded_export("daily", speed=speed, download_timeout=download_timeout)
+    result = asyncio.run(
+        run_recorded_export("daily", speed=speed, download_timeout=download_timeout)
+    )
     click.echo(f"Export saved: {result}")
 
 
@@ -48,7 +51,9 @@ def bulk(speed: float, download_timeout: float):
     """Replay the 'bulk' export sequence and ingest the result."""
     from automation.export import run_recorded_export
 
-    result = run_recorded_export("bulk", speed=speed, download_timeout=download_timeout)
+    result = asyncio.run(
+        run_recorded_export("bulk", speed=speed, download_timeout=download_timeout)
+    )
     click.echo(f"Export saved: {result}")
 
 
@@ -86,7 +91,9 @@ def export_daily(model: str, download_timeout: float):
     """AI-driven daily export: Claude navigates MacroFactor to export last 7 days."""
     from automation.computer_use import run_export_with_agent
 
-    result = run_export_with_agent("daily", model=model, download_timeout=download_timeout)
+    result = asyncio.run(
+        run_export_with_agent("daily", model=model, download_timeout=download_timeout)
+    )
     click.echo(f"Export saved: {result}")
 
 
@@ -100,7 +107,9 @@ def export_bulk(model: str, download_timeout: float):
     """AI-driven bulk export: Claude navigates MacroFactor to export all data."""
     from automation.computer_use import run_export_with_agent
 
-    result = run_export_with_agent("bulk", model=model, download_timeout=download_timeout)
+    result = asyncio.run(
+        run_export_with_agent("bulk", model=model, download_timeout=download_timeout)
+    )
     click.echo(f"Export saved: {result}")
 
 
@@ -118,5 +127,5 @@ def run_agent(instruction: str, model: str, max_iterations: int):
     """
     from automation.computer_use import agent_loop
 
-    result = agent_loop(instruction, model=model, max_iterations=max_iterations)
+    result = asyncio.run(agent_loop(instruction, model=model, max_iterations=max_iterations))
     click.echo(result)
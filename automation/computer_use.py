@@ -6,24 +6,38 @@ actions to take (click, scroll, type), and we execute those actions via
 pyautogui.
 """
 
+import asyncio
 import base64
+import functools
 import io
 import logging
 import subprocess
 import sys
 import time
+from collections import deque
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any
 
-import pyautogui
+from PIL import Image
 
-from automation.recorder import get_app_window_position
+from automation.vision import grab_region, wait_until_stable
 
 logger = logging.getLogger("macroclaw.computer_use")
 
 APP_NAME = "MacroFactor"
 MAX_ITERATIONS = 50
 MAX_HISTORY_SCREENSHOTS = 2
+# Minimum seconds between API calls, to stay under rate limits.
+MIN_CALL_INTERVAL = 3.0
+JPEG_QUALITY = 50
+# Text longer than this is pasted via the clipboard rather than typed.
+PASTE_THRESHOLD = 8
+# Time the target app gets to read a paste before the old clipboard is restored;
+# apps read the pasteboard lazily, so leave room for one that is busy.
+PASTE_SETTLE = 0.5
+# Screenshots are downscaled to fit this box; Claude rescales larger images anyway.
+MAX_SCREENSHOT_SIZE = (1280, 800)
 
 _MODEL_CONFIG = {
     "claude-sonnet-4-5-20250929": {
@@ -57,35 +71,46 @@ _SYSTEM_PROMPT = (
 )
 
 
+# Every alias and canonical model ID -> (model_id, tool_type, betas).
+_RESOLVED: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    name: (model_id, _MODEL_CONFIG[model_id]["tool_type"], tuple(_MODEL_CONFIG[model_id]["betas"]))
+    for name, model_id in {**{m: m for m in _MODEL_CONFIG}, **_MODEL_ALIASES}.items()
+}
+_DEFAULT_MODEL_ID = "claude-sonnet-4-5-20250929"
+
+
 def _resolve_model(model: str) -> str:
-    return _MODEL_ALIASES.get(model, model)
+    resolved = _RESOLVED.get(model)
+    return resolved[0] if resolved else model
 
 
-def _get_tool_config(model: str) -> dict:
-    model_id = _resolve_model(model)
-    config = _MODEL_CONFIG.get(model_id)
-    if not config:
-        config = _MODEL_CONFIG["claude-sonnet-4-5-20250929"]
-    return config
+def _get_tool_config(model: str) -> tuple[str, tuple[str, ...]]:
+    """Return ``(tool_type, betas)`` for *model*, defaulting to the Sonnet config."""
+    _, tool_type, betas = _RESOLVED.get(model, _RESOLVED[_DEFAULT_MODEL_ID])
+    return tool_type, betas
+
+
+@functools.lru_cache(maxsize=8)
+def _system_prompt(app_name: str, width: int, height: int) -> str:
+    return _SYSTEM_PROMPT.format(app_name=app_name, w=width, h=height)
 
 
 def _restart_app(app_name: str = APP_NAME) -> None:
     """Kill and reopen the app to ensure a fresh home screen."""
+    from automation.app import run_applescript
+    from automation.recorder import invalidate_window_position
+
     _log(f"Restarting {app_name}...")
-    subprocess.run(
-        ["osascript", "-e", f'tell application "{app_name}" to quit'],
-        capture_output=True,
-    )
+    invalidate_window_position(app_name)
+    run_applescript(f'tell application "{app_name}" to quit')
     time.sleep(1)
     subprocess.run(["pkill", "-x", "Runner"], capture_output=True)
     time.sleep(1)
     subprocess.run(["open", "-a", app_name], check=True)
     time.sleep(4)
-    subprocess.run(
-        ["osascript", "-e",
-         f'tell application "System Events" to tell process "{app_name}" '
-         f'to set frontmost to true'],
-        capture_output=True,
+    run_applescript(
+        f'tell application "System Events" to tell process "{app_name}" '
+        f'to set frontmost to true'
     )
     time.sleep(0.5)
     _log(f"{app_name} restarted.")
@@ -94,20 +119,104 @@ def _restart_app(app_name: str = APP_NAME) -> None:
 def _capture_window_screenshot(
     app_name: str = APP_NAME,
 ) -> tuple[str, tuple[int, int, int, int]]:
-    """Capture a JPEG screenshot cropped to the app window."""
+    """Capture a JPEG screenshot cropped to the app window, scaled to the display size."""
+    from automation.recorder import get_app_window_position
+
     wx, wy, ww, wh = get_app_window_position(app_name)
-    screenshot = pyautogui.screenshot(region=(wx, wy, ww, wh)).convert("RGB")
+    screenshot = grab_region((wx, wy, ww, wh))
+    try:
+        # Also folds Retina captures (2x the window's point size) back to the display grid.
+        size = _display_size(ww, wh)
+        if screenshot.size != size:
+            resized = screenshot.resize(size, Image.Resampling.LANCZOS)
+            screenshot.close()
+            screenshot = resized
+        jpeg = _encode_jpeg(screenshot)
+    finally:
+        # Free the pixel buffers now rather than whenever the frame is collected.
+        screenshot.close()
+
+    b64 = base64.standard_b64encode(jpeg).decode("ascii")
+
+    return b64, (wx, wy, ww, wh)
 
+
+def _screenshot_scale(width: int, height: int) -> float:
+    """Factor that maps window pixels onto screenshot pixels (never upscales)."""
+    max_w, max_h = MAX_SCREENSHOT_SIZE
+    return min(1.0, max_w / width, max_h / height)
+
+
+def _display_size(width: int, height: int) -> tuple[int, int]:
+    """Size of the screenshot Claude sees for a window of *width* x *height*."""
+    scale = _screenshot_scale(width, height)
+    return round(width * scale), round(height * scale)
+
+
+@functools.cache
+def _turbojpeg() -> Any:
+    """Return a shared ``TurboJPEG`` encoder, or ``None`` if libturbojpeg is unavailable."""
+    try:
+        from turbojpeg import TurboJPEG
+        return TurboJPEG()
+    except (ImportError, OSError, RuntimeError):
+        logger.debug("libturbojpeg not available; using Pillow for JPEG encoding")
+        return None
+
+
+def _encode_jpeg(image: Any, quality: int = JPEG_QUALITY) -> bytes:
+    """Encode a PIL image as JPEG, via libturbojpeg's SIMD encoder when installed."""
+    encoder = _turbojpeg()
+    if encoder is not None and image.mode in ("RGB", "RGBA"):
+        import numpy as np
+        from turbojpeg import TJPF_RGB, TJPF_RGBA, TJSAMP_420
+
+        pixel_format = TJPF_RGBA if image.mode == "RGBA" else TJPF_RGB
+        return encoder.encode(
+            np.asarray(image), quality=quality,
+            pixel_format=pixel_format, jpeg_subsample=TJSAMP_420,
+        )
+
+    rgb = image if image.mode == "RGB" else image.convert("RGB")
     buf = io.BytesIO()
-    screenshot.save(buf, format="JPEG", quality=50)
-    b64 = base64.standard_b64encode(buf.getvalue()).decode("utf-8")
+    rgb.save(buf, format="JPEG", quality=quality, optimize=True)
+    if rgb is not image:
+        rgb.close()
+    return buf.getvalue()
 
-    return b64, (wx, wy, ww, wh)
+
+def _type_text(text: str) -> None:
+    """Type *text* into the focused field.
+
+    Longer strings are pasted via the clipboard, which is one keystroke
+    instead of one per character; short ones are typed without delay.  The
+    user's clipboard text is saved beforehand and put back afterwards; a
+    clipboard holding no text (e.g. an image) is left as the pasted text
+    rather than being overwritten with nothing.
+    """
+    import pyautogui
+
+    if len(text) > PASTE_THRESHOLD:
+        try:
+            saved = subprocess.run(["pbpaste"], capture_output=True, check=True).stdout
+            subprocess.run(["pbcopy"], input=text.encode(), check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("Clipboard paste failed (%s); typing instead", e)
+        else:
+            try:
+                pyautogui.hotkey("command", "v")
+                time.sleep(PASTE_SETTLE)
+            finally:
+                if saved:
+                    subprocess.run(["pbcopy"], input=saved, check=False)
+            return
+    pyautogui.write(text, interval=0)
 
 
 def _execute_action(
     action: dict[str, Any],
     window_bounds: tuple[int, int, int, int],
+    app_name: str = APP_NAME,
 ) -> None:
     """Execute a Claude computer use action via pyautogui.
 
@@ -121,14 +230,23 @@ def _execute_action(
     - mouse_move: coordinate=[x,y]
     - screenshot: no params (no-op, we auto-capture)
     - wait: duration=seconds
+
+    Clicks, drags and scrolls return once the window stops changing (see
+    :func:`automation.vision.wait_until_stable`) instead of after a fixed delay.
     """
+    import pyautogui
+
+    from automation.recorder import invalidate_window_position
+
+    pyautogui.PAUSE = 0  # settle waits below are explicit
     wx, wy, ww, wh = window_bounds
     action_type = action.get("action")
     coord = action.get("coordinate")
+    scale = _screenshot_scale(ww, wh)
 
     if coord:
-        abs_x = wx + coord[0]
-        abs_y = wy + coord[1]
+        abs_x = wx + round(coord[0] / scale)
+        abs_y = wy + round(coord[1] / scale)
     else:
         abs_x = abs_y = None
 
@@ -138,30 +256,31 @@ def _execute_action(
     elif action_type == "left_click":
         _log(f"  -> click ({coord[0]}, {coord[1]})")
         pyautogui.click(abs_x, abs_y)
-        time.sleep(0.5)
+        wait_until_stable(window_bounds, max_wait=0.8)
 
     elif action_type == "left_click_drag":
         start = action.get("start_coordinate", coord)
         end = coord
-        sx, sy = wx + start[0], wy + start[1]
-        ex, ey = wx + end[0], wy + end[1]
+        sx, sy = wx + round(start[0] / scale), wy + round(start[1] / scale)
+        ex, ey = abs_x, abs_y
         _log(f"  -> drag ({start[0]},{start[1]}) to ({end[0]},{end[1]})")
         pyautogui.moveTo(sx, sy, duration=0.1)
         pyautogui.mouseDown()
         pyautogui.moveTo(ex, ey, duration=0.4)
         pyautogui.mouseUp()
-        time.sleep(1.0)
+        invalidate_window_position(app_name)
+        wait_until_stable(window_bounds, max_wait=1.5)
 
     elif action_type == "right_click":
         _log(f"  -> right-click ({coord[0]}, {coord[1]})")
         pyautogui.rightClick(abs_x, abs_y)
-        time.sleep(0.5)
+        wait_until_stable(window_bounds, max_wait=0.8)
 
     elif action_type in ("double_click", "triple_click"):
         clicks = 3 if action_type == "triple_click" else 2
         _log(f"  -> {action_type} ({coord[0]}, {coord[1]})")
         pyautogui.click(abs_x, abs_y, clicks=clicks)
-        time.sleep(0.5)
+        wait_until_stable(window_bounds, max_wait=0.8)
 
     elif action_type == "mouse_move":
         _log(f"  -> move ({coord[0]}, {coord[1]})")
@@ -187,12 +306,14 @@ def _execute_action(
             pyautogui.hscroll(-pixels)
         elif direction == "right":
             pyautogui.hscroll(pixels)
-        time.sleep(1.0)
+        invalidate_window_position(app_name)
+        # Scroll momentum keeps the screen moving; wait for it to coast out.
+        wait_until_stable(window_bounds, max_wait=1.5)
 
     elif action_type == "type":
         text = action.get("text", "")
         _log(f"  -> type '{text[:50]}'")
-        pyautogui.write(text, interval=0.03)
+        _type_text(text)
         time.sleep(0.3)
 
     elif action_type == "key":
@@ -231,13 +352,11 @@ def _execute_action(
         _log(f"  -> UNKNOWN: {action_type} (raw: {action})")
 
 
-def _build_tool_result(
-    tool_use_id: str,
-    app_name: str = APP_NAME,
-) -> tuple[dict, tuple[int, int, int, int]]:
-    """Build a tool_result with a fresh JPEG screenshot."""
-    b64, bounds = _capture_window_screenshot(app_name)
-    result = {
+def _build_tool_result(tool_use_id: str, b64: str | None = None) -> dict:
+    """Build a tool_result, carrying the JPEG screenshot *b64* if given."""
+    if b64 is None:
+        return {"type": "tool_result", "tool_use_id": tool_use_id, "content": "ok"}
+    return {
         "type": "tool_result",
         "tool_use_id": tool_use_id,
         "content": [
@@ -251,19 +370,9 @@ def _build_tool_result(
             }
         ],
     }
-    return result, bounds
-
-
-def _trim_messages(messages: list[dict], keep_first: int = 1) -> list[dict]:
-    """Keep first message + last N exchanges to limit token growth."""
-    if len(messages) <= keep_first + MAX_HISTORY_SCREENSHOTS * 2:
-        return messages
-    head = messages[:keep_first]
-    tail = messages[-(MAX_HISTORY_SCREENSHOTS * 2):]
-    return head + tail
 
 
-def agent_loop(
+async def agent_loop(
     instruction: str,
     model: str = "claude-sonnet-4-5",
     max_iterations: int = MAX_ITERATIONS,
@@ -271,70 +380,78 @@ def agent_loop(
     restart: bool = False,
     callback: Callable[[int, str, dict | None], None] | None = None,
 ) -> str:
-    """Run the computer use agent loop."""
+    """Run the computer use agent loop.
+
+    Blocking UI work (app control, pyautogui actions, screenshots) runs in a
+    worker thread so it overlaps with the rate-limit pacing between API calls.
+    """
     import anthropic
 
     model_id = _resolve_model(model)
-    config = _get_tool_config(model)
-    client = anthropic.Anthropic(max_retries=5)
+    tool_type, betas = _get_tool_config(model)
+    client = anthropic.AsyncAnthropic(max_retries=5)
 
     if restart:
-        _restart_app(app_name)
+        await asyncio.to_thread(_restart_app, app_name)
     else:
         from automation.app import focus_app
-        focus_app(app_name)
-        time.sleep(1.0)
+        await asyncio.to_thread(focus_app, app_name)
+        await asyncio.sleep(1.0)
 
-    b64, bounds = _capture_window_screenshot(app_name)
+    b64, bounds = await asyncio.to_thread(_capture_window_screenshot, app_name)
 
+    display_w, display_h = _display_size(bounds[2], bounds[3])
     tool_def = {
-        "type": config["tool_type"],
+        "type": tool_type,
         "name": "computer",
-        "display_width_px": bounds[2],
-        "display_height_px": bounds[3],
+        "display_width_px": display_w,
+        "display_height_px": display_h,
     }
 
-    system_prompt = _SYSTEM_PROMPT.format(
-        app_name=app_name, w=bounds[2], h=bounds[3]
-    )
+    system_prompt = _system_prompt(app_name, display_w, display_h)
 
-    messages = [
-        {
-            "role": "user",
-            "content": [
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/jpeg",
-                        "data": b64,
-                    },
+    # The instruction stays pinned; older exchanges (and their screenshots)
+    # fall out of the deque as new ones arrive.
+    first_message = {
+        "role": "user",
+        "content": [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": "image/jpeg",
+                    "data": b64,
                 },
-                {"type": "text", "text": instruction},
-            ],
-        }
-    ]
+            },
+            {"type": "text", "text": instruction},
+        ],
+    }
+    history: deque[dict] = deque(maxlen=MAX_HISTORY_SCREENSHOTS * 2)
 
     final_text = ""
+    loop = asyncio.get_running_loop()
+    last_call = None
 
     for iteration in range(1, max_iterations + 1):
-        if iteration > 1:
-            time.sleep(3)  # pace requests to stay under rate limits
+        if last_call is not None:
+            # Pace requests, counting time already spent on actions/screenshots.
+            remaining = MIN_CALL_INTERVAL - (loop.time() - last_call)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
 
         if callback:
             callback(iteration, "api_call", None)
 
         _log(f"[{iteration}/{max_iterations}] API call...")
 
-        trimmed = _trim_messages(messages)
-
-        response = client.beta.messages.create(
+        last_call = loop.time()
+        response = await client.beta.messages.create(
             model=model_id,
             max_tokens=1024,
             system=system_prompt,
             tools=[tool_def],
-            messages=trimmed,
-            betas=config["betas"],
+            messages=[first_message, *history],
+            betas=list(betas),
         )
 
         text_blocks = [block.text for block in response.content if block.type == "text"]
@@ -349,41 +466,37 @@ def agent_loop(
                 callback(iteration, "done", {"text": final_text})
             return final_text
 
-        tool_results = []
-        for block in response.content:
-            if block.type != "tool_use":
-                continue
-
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        for block in tool_uses:
             action = block.input
             action_type = action.get("action", "unknown")
 
             if callback:
                 callback(iteration, "action", {"action": action_type, "input": action})
 
-            try:
-                bounds = get_app_window_position(app_name)
-            except RuntimeError:
-                pass
+            # bounds come from the screenshot Claude just looked at
+            await asyncio.to_thread(_execute_action, action, bounds, app_name)
 
-            _execute_action(action, bounds)
-            result, bounds = _build_tool_result(block.id, app_name)
-            tool_results.append(result)
+        # One capture after all of this turn's actions; only the last result needs it.
+        b64, bounds = await asyncio.to_thread(_capture_window_screenshot, app_name)
+        tool_results = [_build_tool_result(block.id) for block in tool_uses[:-1]]
+        tool_results.append(_build_tool_result(tool_uses[-1].id, b64))
 
-        messages.append({"role": "assistant", "content": response.content})
-        messages.append({"role": "user", "content": tool_results})
+        history.append({"role": "assistant", "content": response.content})
+        history.append({"role": "user", "content": tool_results})
 
     _log(f"Max iterations ({max_iterations}) reached.")
     return final_text or "(max iterations reached)"
 
 
-def run_export_with_agent(
+async def run_export_with_agent(
     export_type: str,
     model: str = "claude-sonnet-4-5",
     download_timeout: float = 30.0,
     app_name: str = APP_NAME,
 ) -> Path:
     """Kill/reopen MacroFactor, run the AI export flow, handle download."""
-    from automation.export import _move_to_imports, _wait_for_download
+    from automation.export import DownloadWatch, download_to_imports
 
     instruction = (
         "Export my MacroFactor data. Execute these steps IN ORDER:\n"
@@ -402,19 +515,20 @@ def run_export_with_agent(
         "DONE after final Save."
     )
 
-    start = time.time()
+    start = time.monotonic()
     _log("=" * 50)
     _log(f"{export_type.upper()} EXPORT — AI agent mode")
     _log("=" * 50)
 
     try:
-        agent_loop(instruction, model=model, app_name=app_name, restart=True)
-        downloaded = _wait_for_download(timeout=download_timeout)
-        imported = _move_to_imports(downloaded)
-        _log(f"{export_type.upper()} EXPORT — done in {time.time() - start:.1f}s -> {imported}")
+        with DownloadWatch() as watch:
+            await agent_loop(instruction, model=model, app_name=app_name, restart=True)
+            imported = await download_to_imports(download_timeout, watch=watch)
+        elapsed = time.monotonic() - start
+        _log(f"{export_type.upper()} EXPORT — done in {elapsed:.1f}s -> {imported}")
         return imported
     except Exception:
-        _log(f"{export_type.upper()} EXPORT — FAILED after {time.time() - start:.1f}s")
+        _log(f"{export_type.upper()} EXPORT — FAILED after {time.monotonic() - start:.1f}s")
         raise
 
 
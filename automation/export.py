@@ -1,50 +1,266 @@
 """Export automation — replays recorded click sequences and handles downloads."""
 
+import asyncio
 import logging
+import os
+import queue
 import shutil
 import time
 from datetime import datetime
 from pathlib import Path
 
+from watchdog.events import FileSystemEvent, PatternMatchingEventHandler
+from watchdog.observers import Observer
+
 from automation.recorder import replay_sequence
 
 logger = logging.getLogger("macroclaw.export")
 
 DOWNLOADS_DIR = Path.home() / "Downloads"
 DEFAULT_IMPORTS_DIR = Path(__file__).parent.parent / "data" / "imports"
+# Without a snapshot, a matching download this many seconds old still counts as new.
+RECENT_DOWNLOAD_AGE = 60.0
+# Warn when less than this is free where exports land (bulk exports are a few MB).
+MIN_FREE_BYTES = 50 * 1024 * 1024
 
 
-def _wait_for_download(
-    timeout: float = 30.0,
-    prefix: str = "MacroFactor",
-    extension: str = ".xlsx",
-) -> Path:
-    """Poll ~/Downloads for a fresh .xlsx file from MacroFactor."""
-    logger.info("Waiting for download (timeout: %.0fs)...", timeout)
-    deadline = time.time() + timeout
+def _iter_downloads(prefix: str, extension: str):
+    """Yield ``os.DirEntry`` objects for regular files in ~/Downloads matching the name filter.
 
-    while time.time() < deadline:
-        for f in DOWNLOADS_DIR.iterdir():
-            if not f.is_file():
-                continue
-            if not f.name.lower().endswith(extension.lower()):
-                continue
-            if prefix.lower() not in f.name.lower():
+    Office lock files (``~$...``) are skipped.
+    """
+    prefix, extension = prefix.lower(), extension.lower()
+    with os.scandir(DOWNLOADS_DIR) as it:
+        for entry in it:
+            name = entry.name.lower()
+            if not name.endswith(extension) or prefix not in name or name.startswith("~$"):
                 continue
-            age = time.time() - f.stat().st_mtime
-            if age < 60:
-                logger.info("Download detected: %s (age: %.1fs)", f.name, age)
-                time.sleep(1.0)
-                return f
-        time.sleep(1.0)
+            if entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int]:
+    """Identify a file version by ``(st_mtime_ns, st_size)``."""
+    return st.st_mtime_ns, st.st_size
+
+
+def _find_recent_download(
+    prefix: str,
+    extension: str,
+    max_age: float = RECENT_DOWNLOAD_AGE,
+    pre_files: dict[str, tuple[int, int]] | None = None,
+) -> Path | None:
+    """Return the newest matching file in ~/Downloads that is new since the export started.
+
+    With *pre_files* (the snapshot taken by :class:`DownloadWatch`), any file
+    that is not in the snapshot, or whose mtime or size has changed since
+    (an export overwriting one of the same name), counts as new.  Without
+    it, the file must have been modified within *max_age* seconds.  Uses a
+    single ``os.scandir`` pass so each entry's cached stat is reused rather
+    than stat-ing every file twice.
+    """
+    newest: tuple[float, str] | None = None
+    for entry in _iter_downloads(prefix, extension):
+        st = entry.stat(follow_symlinks=False)
+        if pre_files is not None and pre_files.get(entry.path) == _stat_key(st):
+            continue
+        mtime = st.st_mtime
+        if newest is None or mtime > newest[0]:
+            newest = (mtime, entry.path)
+
+    if newest is None:
+        return None
+    age = time.time() - newest[0]
+    if pre_files is None and age >= max_age:
+        return None
+    path = Path(newest[1])
+    logger.info("Download detected: %s (age: %.1fs)", path.name, age)
+    return path
+
+
+def _wait_for_stable_size(
+    path: Path,
+    interval: float = 0.1,
+    stable_for: float = 0.5,
+    timeout: float = 10.0,
+) -> None:
+    """Block until *path* has kept the same non-zero size for *stable_for* seconds.
 
+    Raises:
+        TimeoutError: If the file is missing or still changing after *timeout*.
+    """
+    deadline = time.monotonic() + timeout
+    last = -1
+    steady_since = None
+    while time.monotonic() < deadline:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = -1
+        now = time.monotonic()
+        if size == last and size > 0:
+            steady_since = steady_since or now
+            if now - steady_since >= stable_for:
+                return
+        else:
+            steady_since = None
+        last = size
+        time.sleep(interval)
+    state = "disappeared" if last < 0 else "was still being written"
+    raise TimeoutError(f"Download {path.name} {state} after {timeout}s")
+
+
+class _DownloadHandler(PatternMatchingEventHandler):
+    """Push newly created, renamed-into-place or overwritten matching files onto a queue."""
+
+    def __init__(self, patterns: list[str], found: queue.Queue) -> None:
+        super().__init__(patterns=patterns, ignore_directories=True, case_sensitive=False)
+        self.found = found
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        self.found.put(Path(event.src_path))
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        self.found.put(Path(event.dest_path))
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        self.found.put(Path(event.src_path))
+
+
+def _poll_for_download(
+    prefix: str,
+    extension: str,
+    timeout: float,
+    pre_files: dict[str, tuple[int, int]] | None = None,
+) -> Path:
+    """Fallback for when ~/Downloads cannot be watched: rescan it every second."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        path = _find_recent_download(prefix, extension, pre_files=pre_files)
+        if path is not None:
+            return path
+        time.sleep(1.0)
     raise TimeoutError(f"No new '{prefix}*{extension}' in {DOWNLOADS_DIR} within {timeout}s")
 
 
-def _move_to_imports(source: Path, imports_dir: Path | None = None) -> Path:
-    """Move a downloaded file to the imports directory with a timestamp prefix."""
-    dest_dir = imports_dir or DEFAULT_IMPORTS_DIR
-    dest_dir.mkdir(parents=True, exist_ok=True)
+class DownloadWatch:
+    """Watch ~/Downloads for a new MacroFactor export.
+
+    Enter the context *before* triggering the export so that the watcher is
+    already armed when the file lands, then call :meth:`wait`.  On entry the
+    matching files already present are recorded with their mtime and size, so
+    the new one (or an overwritten one) is found by comparison rather than
+    by age.
+
+    Args:
+        prefix: Substring the exported file name contains.
+        extension: File extension of the export.
+        snapshot: Record pre-existing files on entry.  Without a snapshot, a
+            matching file modified in the last ``RECENT_DOWNLOAD_AGE`` seconds
+            counts as new.
+
+    Raises:
+        FileNotFoundError: On entry, if ~/Downloads does not exist.
+    """
+
+    def __init__(
+        self, prefix: str = "MacroFactor", extension: str = ".xlsx", snapshot: bool = True
+    ) -> None:
+        self.prefix = prefix
+        self.extension = extension
+        self.snapshot = snapshot
+        self.pre_files: dict[str, tuple[int, int]] | None = None
+        self._found: queue.Queue[Path] = queue.Queue()
+        self._observer: Observer | None = None
+
+    def __enter__(self) -> "DownloadWatch":
+        if not DOWNLOADS_DIR.is_dir():
+            raise FileNotFoundError(f"Downloads directory {DOWNLOADS_DIR} does not exist")
+        if self.snapshot:
+            self.pre_files = {
+                e.path: _stat_key(e.stat(follow_symlinks=False))
+                for e in _iter_downloads(self.prefix, self.extension)
+            }
+        handler = _DownloadHandler([f"*{self.prefix}*{self.extension}"], self._found)
+        observer = Observer()
+        try:
+            observer.schedule(handler, str(DOWNLOADS_DIR), recursive=False)
+            observer.start()
+        except OSError as e:
+            logger.warning("Cannot watch %s (%s); polling instead", DOWNLOADS_DIR, e)
+        else:
+            self._observer = observer
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _is_new(self, path: Path) -> bool:
+        """Whether an event's *path* is a new or changed export.
+
+        Rejects lock files, files that are already gone, and files whose
+        mtime and size still match the snapshot (e.g. only a ``chmod``).
+        """
+        if path.name.startswith("~$"):
+            return False
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        if self.pre_files is None:
+            return time.time() - st.st_mtime < RECENT_DOWNLOAD_AGE
+        return self.pre_files.get(str(path)) != _stat_key(st)
+
+    def wait(self, timeout: float = 30.0) -> Path:
+        """Block until the new export has landed and finished writing.
+
+        Raises:
+            TimeoutError: If no new file appears within *timeout* seconds, or
+                it does not finish writing.
+        """
+        logger.info("Waiting for download (timeout: %.0fs)...", timeout)
+        if self._observer is None:
+            path = _poll_for_download(self.prefix, self.extension, timeout, self.pre_files)
+        else:
+            # One scan catches a file that landed before the watch was armed.
+            path = _find_recent_download(self.prefix, self.extension, pre_files=self.pre_files)
+            deadline = time.monotonic() + timeout
+            while path is None:
+                try:
+                    candidate = self._found.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No new '{self.prefix}*{self.extension}' in {DOWNLOADS_DIR} "
+                        f"within {timeout}s"
+                    ) from None
+                if self._is_new(candidate):
+                    path = candidate
+                    logger.info("Download detected: %s", path.name)
+                else:
+                    logger.debug("Ignoring event for %s: not a new download", candidate.name)
+        _wait_for_stable_size(path)
+        return path
+
+
+def _wait_for_download(timeout: float = 30.0, watch: DownloadWatch | None = None) -> Path:
+    """Wait for a fresh .xlsx file from MacroFactor to land in ~/Downloads.
+
+    Uses *watch* if given; otherwise arms a watch now, without a snapshot.
+    """
+    if watch is not None:
+        return watch.wait(timeout)
+    with DownloadWatch(snapshot=False) as watch:
+        return watch.wait(timeout)
+
+
+def _move_to_imports(source: Path, dest_dir: Path) -> Path:
+    """Move a downloaded file into *dest_dir* with a timestamp prefix.
+
+    *dest_dir* must already exist; see :func:`_prepare_imports_dir`.
+    """
     ts = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
     dest = dest_dir / f"{ts}_{source.name}"
     shutil.move(str(source), str(dest))
@@ -52,7 +268,35 @@ def _move_to_imports(source: Path, imports_dir: Path | None = None) -> Path:
     return dest
 
 
-def run_recorded_export(
+def _prepare_imports_dir(imports_dir: Path | None = None) -> Path:
+    """Create the imports directory and warn if its filesystem is nearly full."""
+    dest_dir = imports_dir or DEFAULT_IMPORTS_DIR
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    free = shutil.disk_usage(dest_dir).free
+    if free < MIN_FREE_BYTES:
+        logger.warning("Only %.1f MB free in %s", free / 1e6, dest_dir)
+    return dest_dir
+
+
+async def download_to_imports(
+    download_timeout: float = 30.0,
+    imports_dir: Path | None = None,
+    watch: DownloadWatch | None = None,
+) -> Path:
+    """Wait for the export download and move it into the imports directory.
+
+    The imports directory is prepared while the download is still in flight.
+    Pass a :class:`DownloadWatch` entered before the export was triggered as
+    *watch*; without one, the watch is armed only now.
+    """
+    downloaded, dest_dir = await asyncio.gather(
+        asyncio.to_thread(_wait_for_download, timeout=download_timeout, watch=watch),
+        asyncio.to_thread(_prepare_imports_dir, imports_dir),
+    )
+    return await asyncio.to_thread(_move_to_imports, downloaded, dest_dir)
+
+
+async def run_recorded_export(
     name: str,
     speed: float = 1.0,
     download_timeout: float = 30.0,
@@ -69,17 +313,18 @@ def run_recorded_export(
     Returns:
         Path to the imported .xlsx file.
     """
-    start = time.time()
+    start = time.monotonic()
     logger.info("=" * 50)
     logger.info("%s EXPORT — starting (replay mode)", name.upper())
     logger.info("=" * 50)
 
     try:
-        replay_sequence(name, speed=speed)
-        downloaded = _wait_for_download(timeout=download_timeout)
-        imported = _move_to_imports(downloaded, imports_dir)
-        logger.info("%s EXPORT — done in %.1fs -> %s", name.upper(), time.time() - start, imported)
+        with DownloadWatch() as watch:
+            await asyncio.to_thread(replay_sequence, name, speed=speed)
+            imported = await download_to_imports(download_timeout, imports_dir, watch)
+        elapsed = time.monotonic() - start
+        logger.info("%s EXPORT — done in %.1fs -> %s", name.upper(), elapsed, imported)
         return imported
     except Exception:
-        logger.error("%s EXPORT — FAILED after %.1fs", name.upper(), time.time() - start)
+        logger.error("%s EXPORT — FAILED after %.1fs", name.upper(), time.monotonic() - start)
         raise
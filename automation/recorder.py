@@ -12,38 +12,57 @@ Usage:
 
 import json
 import logging
+import re
 import subprocess
 import time
 from pathlib import Path
 
-import pyautogui
-
 logger = logging.getLogger("macroclaw.recorder")
 
 SEQUENCES_DIR = Path(__file__).parent.parent / "data" / "sequences"
 
+# Seconds a window-bounds lookup stays valid; the window rarely moves mid-run.
+WINDOW_CACHE_TTL = 2.0
+_window_cache: dict[str, tuple[float, tuple[int, int, int, int]]] = {}
+_sequence_cache: dict[Path, tuple[float, dict]] = {}
+
+# Scroll events closer together than this (seconds) belong to one gesture.
+SCROLL_BURST_GAP = 0.15
+# Largest scroll (in lines) posted as a single wheel event during replay.
+SCROLL_CHUNK_LINES = 40
+
+
+def get_app_window_position(
+    app_name: str = "MacroFactor",
+    max_age: float = WINDOW_CACHE_TTL,
+) -> tuple[int, int, int, int]:
+    """Get the app window bounds (x, y, width, height) via AppleScript.
+
+    A lookup younger than *max_age* seconds is reused; pass ``0`` to force a
+    fresh query.
+    """
+    from automation.app import run_applescript
+
+    cached = _window_cache.get(app_name)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[1]
 
-def get_app_window_position(app_name: str = "MacroFactor") -> tuple[int, int, int, int]:
-    """Get the app window bounds (x, y, width, height) via AppleScript."""
-    script = f'''
-    tell application "System Events"
-        tell process "{app_name}"
-            set frontWindow to first window
-            set {{x, y}} to position of frontWindow
-            set {{w, h}} to size of frontWindow
-        end tell
-    end tell
-    return (x as text) & " " & (y as text) & " " & (w as text) & " " & (h as text)
-    '''
-    result = subprocess.run(
-        ["osascript", "-e", script],
-        capture_output=True, text=True,
+    out = run_applescript(
+        f'tell application "System Events" to tell process "{app_name}" '
+        f"to get {{position, size}} of first window"
     )
-    if result.returncode != 0:
-        raise RuntimeError(f"Could not get window position: {result.stderr.strip()}")
+    parts = re.findall(r"-?\d+", out)
+    if len(parts) != 4:
+        raise RuntimeError(f"Could not get window position: {out or 'no output'}")
 
-    parts = result.stdout.strip().split()
-    return int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
+    bounds = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
+    _window_cache[app_name] = (time.monotonic(), bounds)
+    return bounds
+
+
+def invalidate_window_position(app_name: str = "MacroFactor") -> None:
+    """Forget the cached bounds, e.g. after the window may have moved."""
+    _window_cache.pop(app_name, None)
 
 
 def record_sequence(name: str, app_name: str = "MacroFactor") -> Path:
@@ -58,7 +77,7 @@ def record_sequence(name: str, app_name: str = "MacroFactor") -> Path:
     subprocess.run(["open", "-a", app_name], check=True)
     time.sleep(3)
 
-    wx, wy, ww, wh = get_app_window_position(app_name)
+    wx, wy, ww, wh = get_app_window_position(app_name, max_age=0)
     print(f"App window: ({wx}, {wy}) {ww}x{wh}")
     print()
     print("Click and scroll through the export flow in MacroFactor.")
@@ -74,7 +93,7 @@ def record_sequence(name: str, app_name: str = "MacroFactor") -> Path:
 
     def _elapsed():
         now = time.time()
-        delay = max(0.3, now - last_event_time[0])
+        delay = max(0.05, now - last_event_time[0])
         last_event_time[0] = now
         return round(delay, 2)
 
@@ -141,29 +160,131 @@ def record_sequence(name: str, app_name: str = "MacroFactor") -> Path:
         "steps": collapsed,
         "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
     }
-    path.write_text(json.dumps(data, indent=2))
+    path.write_text(json.dumps(data, separators=(",", ":")))
     print(f"\nSaved {len(collapsed)} steps to {path}")
     return path
 
 
 def _collapse_scrolls(steps: list[dict]) -> list[dict]:
-    """Merge consecutive scroll events into single scroll steps."""
-    if not steps:
-        return steps
-
-    collapsed = [steps[0]]
-    for step in steps[1:]:
-        prev = collapsed[-1]
-        if step["type"] == "scroll" and prev["type"] == "scroll":
-            # Merge: accumulate dy, keep position of first
-            prev["dy"] = prev.get("dy", 0) + step.get("dy", 0)
-            prev["dx"] = prev.get("dx", 0) + step.get("dx", 0)
-            prev["description"] = f"Scroll dy={prev['dy']}"
-        else:
+    """Merge bursts of scroll events into single scroll steps.
+
+    A scroll that follows another within ``SCROLL_BURST_GAP`` seconds is part
+    of the same gesture; its ``dx``/``dy`` are added to the open step.  A
+    longer pause, or any non-scroll step, closes the burst.  The input dicts
+    are not modified.
+    """
+    collapsed: list[dict] = []
+    burst: dict | None = None
+    for step in steps:
+        if step["type"] != "scroll":
+            burst = None
             collapsed.append(step)
+        elif burst is not None and step["delay_before"] < SCROLL_BURST_GAP:
+            burst["dx"] += step.get("dx", 0)
+            burst["dy"] += step.get("dy", 0)
+            burst["description"] = f"Scroll dy={burst['dy']}"
+        else:
+            burst = {**step, "dx": step.get("dx", 0), "dy": step.get("dy", 0)}
+            collapsed.append(burst)
     return collapsed
 
 
+def _post_mouse(event_type: int, x: float, y: float) -> None:
+    import Quartz
+
+    event = Quartz.CGEventCreateMouseEvent(None, event_type, (x, y), Quartz.kCGMouseButtonLeft)
+    Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+
+
+def _move(x: float, y: float) -> None:
+    """Warp the pointer to (x, y) with a single CoreGraphics event."""
+    import Quartz
+
+    _post_mouse(Quartz.kCGEventMouseMoved, x, y)
+
+
+def _click(x: float, y: float) -> None:
+    """Left-click at (x, y) by posting CoreGraphics events directly.
+
+    Avoids pyautogui's per-call ``PAUSE`` and tweened ``moveTo``.
+    """
+    import Quartz
+
+    _post_mouse(Quartz.kCGEventMouseMoved, x, y)
+    time.sleep(0.005)
+    _post_mouse(Quartz.kCGEventLeftMouseDown, x, y)
+    time.sleep(0.005)
+    _post_mouse(Quartz.kCGEventLeftMouseUp, x, y)
+
+
+def _scroll(dy: int) -> None:
+    """Scroll vertically by *dy* lines (same units as ``pyautogui.scroll``).
+
+    Large totals are posted as a burst of wheel events of at most
+    ``SCROLL_CHUNK_LINES`` lines each, 20 ms apart.
+    """
+    import Quartz
+
+    sign = 1 if dy > 0 else -1
+    remaining = abs(dy)
+    while remaining > 0:
+        chunk = min(remaining, SCROLL_CHUNK_LINES)
+        event = Quartz.CGEventCreateScrollWheelEvent(
+            None, Quartz.kCGScrollEventUnitLine, 1, sign * chunk
+        )
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        remaining -= chunk
+        if remaining:
+            time.sleep(0.02)
+
+
+def _load_sequence(path: Path) -> dict:
+    """Parse a sequence file, reusing the previous parse while its mtime is unchanged."""
+    mtime = path.stat().st_mtime
+    cached = _sequence_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    data = json.loads(path.read_text())
+    _sequence_cache[path] = (mtime, data)
+    return data
+
+
+def _compile_steps(
+    steps: list[dict],
+    window: tuple[int, int, int, int],
+    speed: float,
+) -> list[tuple[str, int, int, int, float, str]]:
+    """Resolve recorded steps to ``(action, abs_x, abs_y, dy, delay, description)``.
+
+    Every step is checked against the current window up front, so a stale
+    recording fails before any input is sent rather than halfway through.
+
+    Raises:
+        ValueError: If any step falls outside the window.
+    """
+    wx, wy, ww, wh = window
+    compiled = []
+    outside = []
+    for i, step in enumerate(steps):
+        rel_x, rel_y = int(step["rel_x"]), int(step["rel_y"])
+        if not (0 <= rel_x <= ww and 0 <= rel_y <= wh):
+            outside.append(f"{i + 1} ({rel_x}, {rel_y})")
+        compiled.append((
+            step.get("type", "click"),
+            wx + rel_x,
+            wy + rel_y,
+            int(step.get("dy", 0)),
+            step.get("delay_before", 1.5) * speed,
+            step.get("description", f"Step {i + 1}"),
+        ))
+    if outside:
+        raise ValueError(
+            f"Steps outside the {ww}x{wh} window: {', '.join(outside)}. "
+            "Re-record the sequence."
+        )
+    return compiled
+
+
 def replay_sequence(name: str, app_name: str = "MacroFactor", speed: float = 1.0) -> None:
     """Replay a recorded click/scroll sequence.
 
@@ -176,13 +297,16 @@ def replay_sequence(name: str, app_name: str = "MacroFactor", speed: float = 1.0
             f"No recorded sequence '{name}'. Run: macroclaw auto record {name}"
         )
 
-    data = json.loads(path.read_text())
+    data = _load_sequence(path)
     steps = data["steps"]
     logger.info("Replaying '%s' (%d steps)", name, len(steps))
 
     # Force-kill and reopen to ensure clean state (home screen)
     # iOS "Designed for iPhone" apps run as "Runner" on macOS
-    subprocess.run(["osascript", "-e", f'tell application "{app_name}" to quit'], capture_output=True)
+    from automation.app import run_applescript
+    from automation.vision import wait_until_stable
+
+    run_applescript(f'tell application "{app_name}" to quit')
     time.sleep(1)
     subprocess.run(["pkill", "-x", "Runner"], capture_output=True)
     time.sleep(1)
@@ -190,23 +314,15 @@ def replay_sequence(name: str, app_name: str = "MacroFactor", speed: float = 1.0
     time.sleep(4)
 
     # Bring window to front and focus it
-    focus_script = f'''
-    tell application "System Events"
-        tell process "{app_name}"
-            set frontmost to true
-        end tell
-    end tell
-    '''
-    subprocess.run(["osascript", "-e", focus_script], capture_output=True)
+    run_applescript(
+        f'tell application "System Events" to tell process "{app_name}" '
+        f"to set frontmost to true"
+    )
     time.sleep(0.5)
 
-    wx, wy, ww, wh = get_app_window_position(app_name)
+    wx, wy, ww, wh = get_app_window_position(app_name, max_age=0)
     logger.info("App window: (%d, %d) %dx%d", wx, wy, ww, wh)
 
-    # Click center of window first to ensure focus
-    pyautogui.click(wx + ww // 2, wy + wh // 2)
-    time.sleep(1)
-
     rec_w = data.get("window_size", {}).get("width", 0)
     rec_h = data.get("window_size", {}).get("height", 0)
     if rec_w and rec_h and (rec_w != ww or rec_h != wh):
@@ -215,27 +331,24 @@ def replay_sequence(name: str, app_name: str = "MacroFactor", speed: float = 1.0
             rec_w, rec_h, ww, wh,
         )
 
-    for i, step in enumerate(steps):
-        delay = step.get("delay_before", 1.5) * speed
-        time.sleep(delay)
+    compiled = _compile_steps(steps, (wx, wy, ww, wh), speed)
 
-        abs_x = wx + int(step["rel_x"])
-        abs_y = wy + int(step["rel_y"])
-        action = step.get("type", "click")
-        desc = step.get("description", f"Step {i+1}")
+    # Click center of window first to ensure focus
+    _click(wx + ww // 2, wy + wh // 2)
+    time.sleep(1)
+
+    for action, abs_x, abs_y, dy, delay, desc in compiled:
+        time.sleep(delay)
 
         if action == "click":
             logger.info("  %s -> click (%d, %d) [waited %.1fs]", desc, abs_x, abs_y, delay)
-            pyautogui.moveTo(abs_x, abs_y, duration=0.15)
-            time.sleep(0.1)
-            pyautogui.click()
+            _click(abs_x, abs_y)
         elif action == "scroll":
-            dy = step.get("dy", 0)
             logger.info("  %s -> scroll dy=%d at (%d, %d) [waited %.1fs]", desc, dy, abs_x, abs_y, delay)
-            pyautogui.moveTo(abs_x, abs_y, duration=0.1)
+            _move(abs_x, abs_y)
             # Send scroll in one go — then wait for momentum to settle
-            pyautogui.scroll(dy)
-            time.sleep(1.0)
+            _scroll(dy)
+            wait_until_stable((wx, wy, ww, wh), max_wait=1.0)
 
     logger.info("Replay complete.")
 
@@ -247,7 +360,7 @@ def edit_sequence(name: str) -> None:
         print(f"No sequence '{name}' found.")
         return
 
-    data = json.loads(path.read_text())
+    data = _load_sequence(path)
     print(f"Sequence: {name} ({len(data['steps'])} steps)")
     print(f"Recorded: {data.get('recorded_at', 'unknown')}")
     print(f"Window: {data.get('window_size', {})}")
@@ -0,0 +1,97 @@
+"""Screen capture and change-detection helpers for MacroFactor automation."""
+
+import logging
+import threading
+import time
+from typing import Any
+
+from PIL import Image, ImageChops, ImageStat
+
+logger = logging.getLogger("macroclaw.vision")
+
+# Mean per-pixel grey-level difference below which two frames count as equal.
+STABLE_THRESHOLD = 1.0
+
+# mss handles are not shareable across threads, so keep one per thread.
+_local = threading.local()
+
+
+def _screen_grab(region: tuple[int, int, int, int]) -> Any:
+    """Grab *region* with this thread's mss handle, returning the raw BGRA shot."""
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        import mss
+
+        sct = _local.sct = mss.mss()
+    x, y, w, h = region
+    return sct.grab({"left": x, "top": y, "width": w, "height": h})
+
+
+def grab_region(region: tuple[int, int, int, int]) -> Image.Image:
+    """Capture screen *region* ``(x, y, width, height)`` as an RGB image.
+
+    Grabs straight from CoreGraphics via ``mss`` instead of shelling out to
+    ``screencapture``.  On Retina displays the image is in device pixels.
+    """
+    raw = _screen_grab(region)
+    return Image.frombuffer("RGB", raw.size, raw.bgra, "raw", "BGRX")
+
+
+def _grab(region: tuple[int, int, int, int]) -> Image.Image:
+    """Capture *region* as a small greyscale frame suitable for diffing.
+
+    The BGRA buffer is wrapped without copying or reordering channels; the
+    swapped red/blue weights in the greyscale conversion don't matter when
+    only comparing frames with each other.  Reducing before converting keeps
+    both passes at 1/16 of the pixels.
+    """
+    raw = _screen_grab(region)
+    return Image.frombuffer("RGBA", raw.size, raw.bgra, "raw", "RGBA", 0, 1).reduce(4).convert("L")
+
+
+def frame_diff(a: Image.Image, b: Image.Image) -> float:
+    """Return the mean absolute grey-level difference between two frames."""
+    return ImageStat.Stat(ImageChops.difference(a, b)).mean[0]
+
+
+def wait_until_stable(
+    region: tuple[int, int, int, int],
+    max_wait: float = 0.8,
+    min_quiet: float = 0.15,
+    interval: float = 0.08,
+) -> bool:
+    """Block until *region* stops changing, or *max_wait* seconds pass.
+
+    Args:
+        region: Screen region ``(x, y, width, height)`` to watch.
+        max_wait: Upper bound on the time spent waiting.
+        min_quiet: How long the region must stay unchanged to count as settled.
+        interval: Delay between frame captures.
+
+    Returns:
+        ``True`` if the region settled, ``False`` if *max_wait* elapsed first.
+    """
+    deadline = time.monotonic() + max_wait
+    prev = _grab(region)
+    next_grab = time.monotonic() + interval
+    quiet_since = None
+
+    while time.monotonic() < deadline:
+        # Pace captures on a fixed schedule so time spent grabbing and
+        # diffing counts toward the interval instead of adding to it.
+        pause = next_grab - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        next_grab += interval
+        cur = _grab(region)
+        now = time.monotonic()
+        if frame_diff(prev, cur) < STABLE_THRESHOLD:
+            quiet_since = quiet_since or now
+            if now - quiet_since >= min_quiet:
+                return True
+        else:
+            quiet_since = None
+        prev = cur
+
+    logger.debug("Region %s still changing after %.2fs", region, max_wait)
+    return False
@@ -10,21 +10,15 @@ import logging
 import sys
 from datetime import date, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-import yaml
-
-from pipeline.ingest import ingest_xlsx
-from pipeline.queries import (
-    get_daily_summary,
-    get_macro_adherence,
-    get_nutrition_log,
-    get_recent_prs,
-    get_weight_trend,
-    get_workouts,
-)
-from pipeline.schema import init_db
-from pipeline.watcher import watch
+
+if TYPE_CHECKING:
+    import duckdb
+
+# duckdb, pandas (via ingest) and watchdog are imported inside the commands
+# that need them so that ``--help`` and config errors stay fast.
 
 logger = logging.getLogger("macroclaw")
 
@@ -50,6 +44,8 @@ def _load_config(config_path: str | None) -> dict:
 
     Searches several conventional locations when *config_path* is ``None``.
     """
+    import yaml
+
     if config_path:
         p = Path(config_path).expanduser().resolve()
         if p.exists():
@@ -72,6 +68,21 @@ def _resolve(cfg: dict, key: str) -> str:
     return str(Path(cfg.get(key, _DEFAULTS[key])).expanduser().resolve())
 
 
+def _get_conn(ctx: click.Context) -> "duckdb.DuckDBPyConnection":
+    """Return the invocation's DuckDB connection, opening it on first use.
+
+    The connection is shared by everything that runs in this process and
+    closed when the command finishes.
+    """
+    from pipeline.schema import init_db
+
+    conn = ctx.obj.get("conn")
+    if conn is None:
+        conn = ctx.obj["conn"] = init_db(_resolve(ctx.obj["cfg"], "db_path"))
+        ctx.call_on_close(conn.close)
+    return conn
+
+
 # ---------------------------------------------------------------------------
 # CLI group
 # ---------------------------------------------------------------------------
@@ -108,11 +119,8 @@ def cli(ctx: click.Context, config_path: str | None, verbose: bool) -> None:
 @click.pass_context
 def init(ctx: click.Context) -> None:
     """Initialize the DuckDB database and create all tables."""
-    cfg = ctx.obj["cfg"]
-    db_path = _resolve(cfg, "db_path")
-    conn = init_db(db_path)
-    conn.close()
-    click.echo(f"Database initialized at {db_path}")
+    _get_conn(ctx)
+    click.echo(f"Database initialized at {_resolve(ctx.obj['cfg'], 'db_path')}")
 
 
 @cli.command()
@@ -125,6 +133,8 @@ def init(ctx: click.Context) -> None:
 @click.pass_context
 def ingest(ctx: click.Context, file: str, export_type: str | None) -> None:
     """Manually ingest a MacroFactor .xlsx export."""
+    from pipeline.ingest import ingest_xlsx
+
     cfg = ctx.obj["cfg"]
     db_path = _resolve(cfg, "db_path")
     archive_dir = _resolve(cfg, "archive_dir")
@@ -134,6 +144,7 @@ def ingest(ctx: click.Context, file: str, export_type: str | None) -> None:
         xlsx_path=file,
         export_type=export_type,
         archive_dir=archive_dir,
+        conn=_get_conn(ctx),
     )
     if stats["skipped"]:
         click.echo(f"Skipped (already imported): {file}")
@@ -153,6 +164,8 @@ def ingest(ctx: click.Context, file: str, export_type: str | None) -> None:
 @click.pass_context
 def watch_cmd(ctx: click.Context, one_shot: bool) -> None:
     """Start the file-system watcher daemon (or one-shot scan)."""
+    from pipeline.watcher import watch
+
     cfg = ctx.obj["cfg"]
     watch(
         db_path=_resolve(cfg, "db_path"),
@@ -167,13 +180,10 @@ def watch_cmd(ctx: click.Context, one_shot: bool) -> None:
 @click.pass_context
 def summary(ctx: click.Context, date_str: str | None) -> None:
     """Print the daily summary for a given date."""
-    cfg = ctx.obj["cfg"]
-    db_path = _resolve(cfg, "db_path")
-    target_date = date_str or date.today().isoformat()
+    from pipeline.queries import get_daily_summary
 
-    conn = init_db(db_path)
-    data = get_daily_summary(conn, target_date)
-    conn.close()
+    target_date = date_str or date.today().isoformat()
+    data = get_daily_summary(_get_conn(ctx), target_date)
 
     if not data:
         click.echo(f"No summary data for {target_date}")
@@ -186,13 +196,10 @@ def summary(ctx: click.Context, date_str: str | None) -> None:
 @click.pass_context
 def nutrition(ctx: click.Context, date_str: str | None) -> None:
     """Print the nutrition log for a given date."""
-    cfg = ctx.obj["cfg"]
-    db_path = _resolve(cfg, "db_path")
-    target_date = date_str or date.today().isoformat()
+    from pipeline.queries import get_nutrition_log
 
-    conn = init_db(db_path)
-    rows = get_nutrition_log(conn, target_date)
-    conn.close()
+    target_date = date_str or date.today().isoformat()
+    rows = get_nutrition_log(_get_conn(ctx), target_date)
 
     if not rows:
         click.echo(f"No nutrition data for {target_date}")
@@ -205,14 +212,11 @@ def nutrition(ctx: click.Context, date_str: str | None) -> None:
 @click.pass_context
 def workouts_cmd(ctx: click.Context, days: int) -> None:
     """Print recent workout data."""
-    cfg = ctx.obj["cfg"]
-    db_path = _resolve(cfg, "db_path")
+    from pipeline.queries import get_workouts
+
     end = date.today().isoformat()
     start = (date.today() - timedelta(days=days)).isoformat()
-
-    conn = init_db(db_path)
-    rows = get_workouts(conn, start, end)
-    conn.close()
+    rows = get_workouts(_get_conn(ctx), start, end)
 
     if not rows:
         click.echo(f"No workout data in the last {days} days")
@@ -225,12 +229,9 @@ def workouts_cmd(ctx: click.Context, days: int) -> None:
 @click.pass_context
 def weight_cmd(ctx: click.Context, days: int) -> None:
     """Print weight trend data."""
-    cfg = ctx.obj["cfg"]
-    db_path = _resolve(cfg, "db_path")
+    from pipeline.queries import get_weight_trend
 
-    conn = init_db(db_path)
-    rows = get_weight_trend(conn, days=days)
-    conn.close()
+    rows = get_weight_trend(_get_conn(ctx), days=days)
 
     if not rows:
         click.echo(f"No weight data in the last {days} days")
@@ -242,6 +243,10 @@ def weight_cmd(ctx: click.Context, days: int) -> None:
 @click.pass_context
 def status(ctx: click.Context) -> None:
     """Show database statistics and the last import time."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pipeline.queries import get_macro_adherence, get_recent_prs
+
     cfg = ctx.obj["cfg"]
     db_path = _resolve(cfg, "db_path")
 
@@ -250,22 +255,42 @@ def status(ctx: click.Context) -> None:
         click.echo(f"Database does not exist at {db_path}. Run 'macroclaw init' first.")
         return
 
-    conn = init_db(db_path)
+    conn = _get_conn(ctx)
 
     tables = ["nutrition_log", "workouts", "weight_log", "daily_summary", "export_history"]
     click.echo(f"Database: {db_path}")
     click.echo(f"Size: {db_file.stat().st_size / 1024:.1f} KB")
     click.echo("")
 
-    for table in tables:
-        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    # The three reads are independent; run each on its own cursor so DuckDB
+    # can execute them concurrently.
+    def _counts_and_last(cur: "duckdb.DuckDBPyConnection") -> tuple:
+        counts = cur.execute(
+            "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t})" for t in tables)
+        ).fetchone()
+        last = cur.execute(
+            "SELECT export_type, file_path, rows_imported, imported_at "
+            "FROM export_history ORDER BY imported_at DESC LIMIT 1"
+        ).fetchone()
+        return counts, last
+
+    cursors = [conn.cursor() for _ in range(3)]
+    try:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            stats_f = pool.submit(_counts_and_last, cursors[0])
+            adherence_f = pool.submit(get_macro_adherence, cursors[1], 7)
+            prs_f = pool.submit(get_recent_prs, cursors[2], 30)
+            counts, last = stats_f.result()
+            adherence = adherence_f.result()
+            prs = prs_f.result()
+    finally:
+        for cur in cursors:
+            cur.close()
+
+    for table, count in zip(tables, counts):
         click.echo(f"  {table}: {count} rows")
 
     # Last import
-    last = conn.execute(
-        "SELECT export_type, file_path, rows_imported, imported_at "
-        "FROM export_history ORDER BY imported_at DESC LIMIT 1"
-    ).fetchone()
     click.echo("")
     if last:
         click.echo(f"Last import: {last[0]} -- {last[2]} rows at {last[3]}")
@@ -274,7 +299,6 @@ def status(ctx: click.Context) -> None:
         click.echo("No imports recorded yet.")
 
     # Macro adherence (last 7 days)
-    adherence = get_macro_adherence(conn, days=7)
     if adherence.get("days_tracked", 0) > 0:
         click.echo("")
         click.echo(f"7-day macro adherence ({adherence['days_tracked']} days tracked):")
@@ -283,7 +307,6 @@ def status(ctx: click.Context) -> None:
         click.echo(f"  Adherence: {adherence.get('adherence_pct', 'N/A')}%")
 
     # Recent PRs
-    prs = get_recent_prs(conn, days=30)
     if prs:
         click.echo("")
         click.echo("Recent PRs (last 30 days):")
@@ -293,8 +316,6 @@ def status(ctx: click.Context) -> None:
                 f"x {pr['reps_at_max']} ({pr['date']})"
             )
 
-    conn.close()
-
 
 # Register automation subcommands
 from automation.cli import auto_group  # noqa: E402
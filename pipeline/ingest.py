@@ -5,16 +5,20 @@ based on column headers, mapping columns to the DuckDB schema, deduplication
 via file hashing, and archival of processed files.
 """
 
+import contextlib
+import functools
 import hashlib
 import json
 import logging
 import re
 import shutil
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import duckdb
+import numpy as np
 import pandas as pd
 
 from pipeline.schema import init_db
@@ -43,6 +47,9 @@ _BULK_SHEET_MAP: dict[str, str] = {
     "Nutrition Program Settings": "targets",
 }
 
+# Trailing unit suffix on bulk-export headers, e.g. " (kcal)" in "Calories (kcal)".
+_UNIT_SUFFIX_RE = re.compile(r"\s*\([^)]*\)\s*$")
+
 # ---------------------------------------------------------------------------
 # Column mappings: MacroFactor header -> DuckDB column
 # ---------------------------------------------------------------------------
@@ -102,11 +109,38 @@ _SUMMARY_COL_MAP: dict[str, str] = {
 
 def _file_hash(path: str) -> str:
     """Return the SHA-256 hex digest of a file's contents."""
-    h = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1 << 16), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _excel_engine() -> str:
+    """Return the pandas Excel engine to use.
+
+    Prefers ``calamine`` (Rust-backed, from the ``fast`` extra) when
+    ``python-calamine`` is installed, falling back to ``openpyxl``.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return "openpyxl"
+    return "calamine"
+
+
+def _open_workbook(xlsx_path: str) -> pd.ExcelFile:
+    """Open *xlsx_path* once so its sheets can be listed and parsed without re-reading the file."""
+    return pd.ExcelFile(xlsx_path, engine=_excel_engine())
+
+
+def _parse_sheet(book: pd.ExcelFile, sheet: str) -> pd.DataFrame:
+    """Parse *sheet* from an open workbook with normalised column names.
+
+    Returns an empty DataFrame when the workbook has no such sheet.
+    """
+    if sheet not in book.sheet_names:
+        logger.warning("Skipping '%s' sheet: not present in workbook", sheet)
+        return pd.DataFrame()
+    return _normalize_columns(book.parse(sheet))
 
 
 def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -119,7 +153,7 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     rename = {}
     for col in df.columns:
-        cleaned = re.sub(r"\s*\([^)]*\)\s*$", "", col).strip()
+        cleaned = _UNIT_SUFFIX_RE.sub("", col).strip()
         if cleaned != col:
             rename[col] = cleaned
     if rename:
@@ -143,14 +177,15 @@ def _detect_export_type(columns: list[str]) -> str:
     col_set = set(columns)
 
     # Order matters: summary and nutrition both have Calories/Protein, so check
-    # summary-specific columns first.
-    if _SUMMARY_SIGNATURES & col_set:
+    # summary-specific columns first.  isdisjoint() stops at the first shared
+    # header without building an intersection set.
+    if not _SUMMARY_SIGNATURES.isdisjoint(col_set):
         return "summary"
-    if _WORKOUT_SIGNATURES & col_set:
+    if not _WORKOUT_SIGNATURES.isdisjoint(col_set):
         return "workout"
-    if _WEIGHT_SIGNATURES & col_set:
+    if not _WEIGHT_SIGNATURES.isdisjoint(col_set):
         return "weight"
-    if _NUTRITION_SIGNATURES & col_set:
+    if not _NUTRITION_SIGNATURES.isdisjoint(col_set):
         return "nutrition"
 
     raise ValueError(
@@ -168,12 +203,38 @@ def _map_columns(df: pd.DataFrame, col_map: dict[str, str]) -> pd.DataFrame:
     return df[[c for c in target_cols if c in df.columns]]
 
 
-def _collect_extra_fields(
-    row: pd.Series, known_cols: set[str]
-) -> str | None:
-    """Serialize unmapped columns into a JSON string for the food_details field."""
-    extras = {k: v for k, v in row.items() if k not in known_cols and pd.notna(v)}
-    return json.dumps(extras) if extras else None
+@functools.lru_cache(maxsize=1)
+def _json_dumps() -> Callable[[Any], str]:
+    """Return the JSON encoder for food_details.
+
+    Uses ``orjson`` (Rust, from the ``fast`` extra) when installed, falling
+    back to :func:`json.dumps`.  orjson writes compact JSON without spaces.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps
+    return lambda obj: orjson.dumps(obj).decode()
+
+
+def _extra_fields_json(extras: pd.DataFrame) -> list[str | None]:
+    """Serialize each row of *extras* (the unmapped columns) to JSON for food_details.
+
+    Null cells are dropped; rows with nothing left become ``None``.
+    """
+    if extras.columns.empty:
+        return [None] * len(extras)
+    # Null-test every cell in one vectorised pass; rows with no extras are
+    # skipped without building a dict.
+    mask = extras.notna().to_numpy()
+    has_extras = mask.any(axis=1)
+    columns = np.array([str(c) for c in extras.columns], dtype=object)
+    values = extras.to_numpy(dtype=object)
+    dumps = _json_dumps()
+    return [
+        dumps(dict(zip(columns[keep], row[keep]))) if any_ else None
+        for row, keep, any_ in zip(values, mask, has_extras)
+    ]
 
 
 def _prepare_nutrition(df: pd.DataFrame, source: str) -> pd.DataFrame:
@@ -181,14 +242,11 @@ def _prepare_nutrition(df: pd.DataFrame, source: str) -> pd.DataFrame:
     mapped = _map_columns(df, _NUTRITION_COL_MAP)
 
     # Collect extra columns as JSON in food_details
-    known = set(_NUTRITION_COL_MAP.values())
-    mapped["food_details"] = df.apply(
-        lambda row: _collect_extra_fields(row, set(_NUTRITION_COL_MAP.keys()) | known),
-        axis=1,
-    )
+    known = set(_NUTRITION_COL_MAP) | set(_NUTRITION_COL_MAP.values())
+    extra_cols = [c for c in df.columns if c not in known]
+    mapped["food_details"] = _extra_fields_json(df[extra_cols])
 
     mapped["source"] = source
-    mapped["imported_at"] = datetime.now()
 
     # Ensure required columns exist even if empty
     for col in ["meal", "food_name"]:
@@ -204,10 +262,9 @@ def _prepare_workouts(df: pd.DataFrame, source: str) -> pd.DataFrame:
     """Prepare a workout DataFrame for insertion."""
     mapped = _map_columns(df, _WORKOUT_COL_MAP)
     mapped["source"] = source
-    mapped["imported_at"] = datetime.now()
 
     if "set_number" not in mapped.columns:
-        mapped["set_number"] = range(1, len(mapped) + 1)
+        mapped["set_number"] = np.arange(1, len(mapped) + 1, dtype=np.int32)
     mapped["exercise_name"] = mapped["exercise_name"].fillna("Unknown")
 
     return mapped
@@ -217,7 +274,6 @@ def _prepare_weight(df: pd.DataFrame, source: str) -> pd.DataFrame:
     """Prepare a weight log DataFrame for insertion."""
     mapped = _map_columns(df, _WEIGHT_COL_MAP)
     mapped["source"] = source
-    mapped["imported_at"] = datetime.now()
     return mapped
 
 
@@ -225,7 +281,6 @@ def _prepare_summary(df: pd.DataFrame, source: str) -> pd.DataFrame:
     """Prepare a daily summary DataFrame for insertion."""
     mapped = _map_columns(df, _SUMMARY_COL_MAP)
     mapped["source"] = source
-    mapped["imported_at"] = datetime.now()
     return mapped
 
 
@@ -238,28 +293,28 @@ _UPSERT_SQL: dict[str, str] = {
         INSERT OR REPLACE INTO nutrition_log
             (date, meal, calories, protein_g, carbs_g, fat_g, fiber_g,
              sodium_mg, food_name, food_details, source, imported_at)
-        SELECT * FROM staging_df
+        SELECT {select} FROM staging_df
     """,
     "workout": """
         INSERT OR REPLACE INTO workouts
             (date, workout_name, duration_min, exercise_name, set_number,
              reps, weight_kg, rpe, notes, source, imported_at)
-        SELECT * FROM staging_df
+        SELECT {select} FROM staging_df
     """,
     "weight": """
         INSERT OR REPLACE INTO weight_log
             (date, scale_weight_kg, trend_weight_kg, source, imported_at)
-        SELECT * FROM staging_df
+        SELECT {select} FROM staging_df
     """,
     "summary": """
         INSERT OR REPLACE INTO daily_summary
             (date, total_calories, total_protein_g, total_carbs_g, total_fat_g,
              calorie_target, protein_target_g, expenditure_kcal, source, imported_at)
-        SELECT * FROM staging_df
+        SELECT {select} FROM staging_df
     """,
 }
 
-# Expected column order for each table so SELECT * aligns correctly.
+# Column order of each INSERT above; also the staging columns selected by name.
 _EXPECTED_COLUMNS: dict[str, list[str]] = {
     "nutrition": [
         "date", "meal", "calories", "protein_g", "carbs_g", "fat_g",
@@ -279,19 +334,61 @@ _EXPECTED_COLUMNS: dict[str, list[str]] = {
 }
 
 
+# DOUBLE and INTEGER columns across the tables, converted by _coerce_types.
+_NUMERIC_COLUMNS = frozenset({
+    "calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sodium_mg",
+    "duration_min", "set_number", "reps", "weight_kg", "rpe",
+    "scale_weight_kg", "trend_weight_kg",
+    "total_calories", "total_protein_g", "total_carbs_g", "total_fat_g",
+    "calorie_target", "protein_target_g", "expenditure_kcal",
+})
+
+# Low-cardinality text columns handed to DuckDB as pandas categoricals.
+_CATEGORICAL_COLUMNS = ("meal", "workout_name", "exercise_name", "source")
+
+# Values for expected columns the prepared frame does not carry.  imported_at
+# is stamped by DuckDB: current_timestamp is fixed for the whole transaction,
+# so every row of one ingest shares it.
+_MISSING_COLUMN_SQL: dict[str, str] = {
+    "imported_at": "current_timestamp",
+}
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
-def _is_bulk_export(xlsx_path: str) -> bool:
-    """Return True if the workbook contains multiple MacroFactor sheets."""
-    from openpyxl import load_workbook
+def _is_bulk_export(sheet_names: list[str]) -> bool:
+    """Return True if *sheet_names* include any MacroFactor bulk-export sheet."""
+    return bool(set(sheet_names) & set(_BULK_SHEET_MAP))
 
-    wb = load_workbook(xlsx_path, read_only=True)
-    names = set(wb.sheetnames)
-    wb.close()
-    return bool(names & set(_BULK_SHEET_MAP))
+
+@contextlib.contextmanager
+def _transaction(conn: duckdb.DuckDBPyConnection) -> Iterator[None]:
+    """Run the enclosed statements as one DuckDB transaction, rolling back on error."""
+    conn.begin()
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the date and numeric columns of a prepared frame in pandas.
+
+    Dates stay datetime64 (DuckDB casts to DATE on insert, so no per-row
+    ``datetime.date`` objects are built).  Doing the conversion here, before
+    any SQL, means a stray non-numeric cell raises ``ValueError`` instead of
+    failing an INSERT and aborting the open transaction.
+    """
+    conversions = {"date": pd.to_datetime(df["date"], cache=True)}
+    for col in df.columns:
+        if col in _NUMERIC_COLUMNS:
+            conversions[col] = pd.to_numeric(df[col])
+    return df.assign(**conversions)
 
 
 def _upsert_df(
@@ -302,38 +399,48 @@ def _upsert_df(
 ) -> int:
     """Upsert a prepared DataFrame into the appropriate table.
 
+    *staging_df* must already have been through :func:`_coerce_types`.
+
     Returns the number of rows inserted.
     """
-    expected = _EXPECTED_COLUMNS[etype]
-    for col in expected:
-        if col not in staging_df.columns:
-            staging_df[col] = None
-    staging_df = staging_df[expected]
-
-    staging_df["date"] = pd.to_datetime(staging_df["date"]).dt.date
-
     rows = len(staging_df)
     if rows == 0:
         return 0
 
+    # Repetitive text columns go over as categoricals: DuckDB reads them as
+    # dictionary-encoded ENUMs instead of converting one string per row.
+    # Columns mixing strings with other values (e.g. a workout named 2) are
+    # left as object, since DuckDB cannot register mixed-type categories.
+    categorical = {
+        col: "category"
+        for col in _CATEGORICAL_COLUMNS
+        if col in staging_df.columns
+        and pd.api.types.infer_dtype(staging_df[col], skipna=True) == "string"
+    }
+    staging_df = staging_df.astype(categorical)
+
+    # Select staging columns by name instead of reordering the frame;
+    # columns this export lacks are inserted as NULL.
+    select = ", ".join(
+        col if col in staging_df.columns else f"{_MISSING_COLUMN_SQL.get(col, 'NULL')} AS {col}"
+        for col in _EXPECTED_COLUMNS[etype]
+    )
+
     logger.info("Inserting %d rows into %s table", rows, etype)
     conn.register("staging_df", staging_df)
-    conn.execute(_UPSERT_SQL[etype])
+    conn.execute(_UPSERT_SQL[etype].format(select=select))
     conn.unregister("staging_df")
     return rows
 
 
-def _apply_nutrition_targets(
-    conn: duckdb.DuckDBPyConnection,
-    targets_df: pd.DataFrame,
-) -> int:
-    """Resolve per-day calorie and protein targets from Nutrition Program Settings.
+def _prepare_programs(targets_df: pd.DataFrame) -> pd.DataFrame | None:
+    """Build the program table from a Nutrition Program Settings sheet.
 
     MacroFactor stores targets as (program_update_date, weekday) pairs.
-    For each date in daily_summary, we find the most recent program that was
-    active on that date and look up the matching weekday row.
+    Returns ``None`` (with a warning) when the sheet lacks required columns.
 
-    Returns the number of daily_summary rows updated.
+    Raises:
+        ValueError: If a date or target cell cannot be converted.
     """
     # Column names after normalisation (unit suffixes stripped)
     date_col = "Program Update Date"
@@ -347,53 +454,57 @@ def _apply_nutrition_targets(
             "Nutrition Program Settings missing columns: %s",
             required - set(targets_df.columns),
         )
-        return 0
+        return None
 
-    # Parse dates (DD/MM/YYYY format)
-    targets_df = targets_df.copy()
-    targets_df["_update_date"] = pd.to_datetime(
-        targets_df[date_col], format="%d/%m/%Y"
-    ).dt.date
-
-    # Sort by update date descending so we can iterate newest-first
-    update_dates = sorted(targets_df["_update_date"].unique(), reverse=True)
-
-    # Build lookup: {(update_date, weekday_name) -> (calories, protein)}
-    lookup: dict[tuple, tuple] = {}
-    for _, row in targets_df.iterrows():
-        key = (row["_update_date"], row[weekday_col])
-        lookup[key] = (row[cal_col], row[protein_col])
-
-    # Get all dates from daily_summary
-    summary_dates = conn.execute(
-        "SELECT date FROM daily_summary ORDER BY date"
-    ).fetchall()
-
-    weekday_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    updated = 0
-
-    for (d,) in summary_dates:
-        # Find the most recent program update <= this date
-        active_update = None
-        for ud in update_dates:
-            if ud <= d:
-                active_update = ud
-                break
-
-        if active_update is None:
-            continue
-
-        wday = weekday_names[d.weekday()]
-        targets = lookup.get((active_update, wday))
-        if targets is None:
-            continue
-
-        cal_target, protein_target = targets
-        conn.execute(
-            "UPDATE daily_summary SET calorie_target = ?, protein_target_g = ? WHERE date = ?",
-            [cal_target, protein_target, d],
-        )
-        updated += 1
+    # Parse dates (DD/MM/YYYY format).  A repeated (update date, weekday)
+    # pair keeps its last row.
+    return pd.DataFrame({
+        "update_date": pd.to_datetime(targets_df[date_col], format="%d/%m/%Y", cache=True),
+        "weekday": targets_df[weekday_col],
+        "calorie_target": pd.to_numeric(targets_df[cal_col]),
+        "protein_target_g": pd.to_numeric(targets_df[protein_col]),
+    }).drop_duplicates(["update_date", "weekday"], keep="last")
+
+
+def _apply_nutrition_targets(
+    conn: duckdb.DuckDBPyConnection,
+    programs: pd.DataFrame,
+) -> int:
+    """Resolve per-day calorie and protein targets from the program table.
+
+    For each date in daily_summary, we find the most recent program that was
+    active on that date and look up the matching weekday row.
+
+    Args:
+        conn: Open DuckDB connection.
+        programs: Output of :func:`_prepare_programs`.
+
+    Returns the number of daily_summary rows updated.
+    """
+    # One set-based UPDATE: pick the newest program update on or before each
+    # summary date, then that program's row for the date's weekday.
+    conn.register("programs_df", programs)
+    try:
+        updated = conn.execute(
+            """
+            UPDATE daily_summary
+            SET calorie_target = p.calorie_target,
+                protein_target_g = p.protein_target_g
+            FROM (
+                SELECT s.date, max(u.update_date) AS update_date
+                FROM daily_summary s
+                JOIN (SELECT DISTINCT update_date FROM programs_df) u
+                  ON u.update_date <= s.date
+                GROUP BY s.date
+            ) active
+            JOIN programs_df p
+              ON p.update_date = active.update_date
+             AND p.weekday = dayname(active.date)
+            WHERE daily_summary.date = active.date
+            """
+        ).fetchone()[0]
+    finally:
+        conn.unregister("programs_df")
 
     logger.info("Updated %d daily_summary rows with calorie/protein targets", updated)
     return updated
@@ -401,31 +512,37 @@ def _apply_nutrition_targets(
 
 def _ingest_bulk(
     conn: duckdb.DuckDBPyConnection,
-    xlsx_path: str,
+    book: pd.ExcelFile,
+    source: str,
 ) -> dict[str, int]:
     """Process a MacroFactor all-time (bulk) export with multiple sheets.
 
+    Every sheet is parsed, mapped and type-checked in pandas before anything
+    is written, and a sheet that fails there is skipped with a warning.  The
+    writes that follow are not guarded: a database error aborts the caller's
+    transaction, so it propagates and nothing is committed.
+
+    Args:
+        conn: Open DuckDB connection.
+        book: The export, already opened with :func:`_open_workbook`.
+        source: File name recorded in the ``source`` column.
+
     Returns a dict mapping table name to rows imported.
     """
-    source = Path(xlsx_path).name
     stats: dict[str, int] = {}
 
     # --- Calories & Macros -> daily_summary (nutrition totals per day) ------
+    summary_df = None
     try:
-        macros_df = _normalize_columns(
-            pd.read_excel(xlsx_path, sheet_name="Calories & Macros", engine="openpyxl")
-        )
+        macros_df = _parse_sheet(book, "Calories & Macros")
         if not macros_df.empty:
-            summary_df = _prepare_summary(macros_df, source)
-            stats["summary"] = _upsert_df(conn, summary_df, "summary", source)
+            summary_df = _coerce_types(_prepare_summary(macros_df, source))
     except Exception as e:
         logger.warning("Skipping 'Calories & Macros' sheet: %s", e)
 
     # --- Scale Weight + Weight Trend -> weight_log --------------------------
     try:
-        scale_df = _normalize_columns(
-            pd.read_excel(xlsx_path, sheet_name="Scale Weight", engine="openpyxl")
-        )
+        scale_df = _parse_sheet(book, "Scale Weight")
         # Rename 'Weight' to 'Scale Weight' if needed (bulk uses "Weight (kg)")
         if "Weight" in scale_df.columns and "Scale Weight" not in scale_df.columns:
             scale_df = scale_df.rename(columns={"Weight": "Scale Weight"})
@@ -434,9 +551,7 @@ def _ingest_bulk(
         scale_df = pd.DataFrame()
 
     try:
-        trend_df = _normalize_columns(
-            pd.read_excel(xlsx_path, sheet_name="Weight Trend", engine="openpyxl")
-        )
+        trend_df = _parse_sheet(book, "Weight Trend")
         if "Trend Weight" not in trend_df.columns:
             # Bulk export names it just "Trend Weight (kg)" -> normalized to "Trend Weight"
             for col in trend_df.columns:
@@ -447,47 +562,70 @@ def _ingest_bulk(
         logger.warning("Skipping 'Weight Trend' sheet: %s", e)
         trend_df = pd.DataFrame()
 
+    weight_df = None
     if not scale_df.empty or not trend_df.empty:
-        # Merge scale and trend on Date
-        if not scale_df.empty and not trend_df.empty:
-            weight_df = pd.merge(scale_df[["Date", "Scale Weight"]], trend_df[["Date", "Trend Weight"]], on="Date", how="outer")
-        elif not scale_df.empty:
-            weight_df = scale_df[["Date", "Scale Weight"]].copy()
-            weight_df["Trend Weight"] = None
-        else:
-            weight_df = trend_df[["Date", "Trend Weight"]].copy()
-            weight_df["Scale Weight"] = None
-
-        prepared = _prepare_weight(weight_df, source)
-        stats["weight"] = _upsert_df(conn, prepared, "weight", source)
+        try:
+            # Merge scale and trend on Date
+            if not scale_df.empty and not trend_df.empty:
+                merged = pd.merge(
+                    scale_df[["Date", "Scale Weight"]],
+                    trend_df[["Date", "Trend Weight"]],
+                    on="Date",
+                    how="outer",
+                )
+            elif not scale_df.empty:
+                merged = scale_df[["Date", "Scale Weight"]].copy()
+                merged["Trend Weight"] = None
+            else:
+                merged = trend_df[["Date", "Trend Weight"]].copy()
+                merged["Scale Weight"] = None
+            weight_df = _coerce_types(_prepare_weight(merged, source))
+        except Exception as e:
+            logger.warning("Skipping weight sheets: %s", e)
 
     # --- Expenditure -> merge into daily_summary ----------------------------
+    exp_updates = None
     try:
-        exp_df = _normalize_columns(
-            pd.read_excel(xlsx_path, sheet_name="Expenditure", engine="openpyxl")
-        )
+        exp_df = _parse_sheet(book, "Expenditure")
         if not exp_df.empty and "Expenditure" in exp_df.columns:
-            exp_df["date"] = pd.to_datetime(exp_df["Date"]).dt.date
-            for _, row in exp_df.iterrows():
-                conn.execute(
-                    "UPDATE daily_summary SET expenditure_kcal = ? WHERE date = ?",
-                    [row["Expenditure"], row["date"]],
-                )
-            stats["expenditure_updates"] = len(exp_df)
+            exp_updates = pd.DataFrame({
+                "date": pd.to_datetime(exp_df["Date"], cache=True),
+                "expenditure_kcal": pd.to_numeric(exp_df["Expenditure"]),
+            }).drop_duplicates("date", keep="last")
+            exp_rows = len(exp_df)
     except Exception as e:
         logger.warning("Skipping 'Expenditure' sheet: %s", e)
 
     # --- Nutrition Program Settings -> calorie/protein targets ---------------
+    programs = None
     try:
-        targets_df = _normalize_columns(
-            pd.read_excel(xlsx_path, sheet_name="Nutrition Program Settings", engine="openpyxl")
-        )
+        targets_df = _parse_sheet(book, "Nutrition Program Settings")
         if not targets_df.empty:
-            updates = _apply_nutrition_targets(conn, targets_df)
-            stats["target_updates"] = updates
+            programs = _prepare_programs(targets_df)
     except Exception as e:
         logger.warning("Skipping 'Nutrition Program Settings' sheet: %s", e)
 
+    # --- Writes --------------------------------------------------------------
+    if summary_df is not None:
+        stats["summary"] = _upsert_df(conn, summary_df, "summary", source)
+
+    if weight_df is not None:
+        stats["weight"] = _upsert_df(conn, weight_df, "weight", source)
+
+    if exp_updates is not None:
+        conn.register("exp_updates", exp_updates)
+        try:
+            conn.execute(
+                "UPDATE daily_summary SET expenditure_kcal = u.expenditure_kcal "
+                "FROM exp_updates u WHERE daily_summary.date = u.date"
+            )
+        finally:
+            conn.unregister("exp_updates")
+        stats["expenditure_updates"] = exp_rows
+
+    if programs is not None:
+        stats["target_updates"] = _apply_nutrition_targets(conn, programs)
+
     return stats
 
 
@@ -496,6 +634,7 @@ def ingest_xlsx(
     xlsx_path: str,
     export_type: str | None = None,
     archive_dir: str | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> dict[str, Any]:
     """Read a MacroFactor .xlsx export and load it into DuckDB.
 
@@ -509,6 +648,8 @@ def ingest_xlsx(
                      ``"summary"``, or ``None`` to auto-detect from headers.
         archive_dir: Directory to move processed files into.  When *None* the
                      file is left in place.
+        conn: An open connection to reuse (e.g. a long-running watcher's).
+              When *None* one is opened on *db_path* and closed afterwards.
 
     Returns:
         A dict with keys ``export_type``, ``rows_imported``, ``file_hash``,
@@ -517,17 +658,41 @@ def ingest_xlsx(
     xlsx_path = str(Path(xlsx_path).expanduser().resolve())
     logger.info("Starting ingestion of %s", xlsx_path)
 
-    # Compute file hash for dedup
-    fhash = _file_hash(xlsx_path)
+    if conn is not None:
+        return _ingest(conn, xlsx_path, export_type, archive_dir)
+
     conn = init_db(db_path)
+    try:
+        return _ingest(conn, xlsx_path, export_type, archive_dir)
+    finally:
+        conn.close()
+
 
-    # Check if already imported
+def _ingest(
+    conn: duckdb.DuckDBPyConnection,
+    xlsx_path: str,
+    export_type: str | None,
+    archive_dir: str | None,
+) -> dict[str, Any]:
+    """Body of :func:`ingest_xlsx`, run on an already-open connection."""
+    # Cheap dedup first: the same path with the same size and mtime was
+    # already imported, so skip reading the file to hash it.
+    st = Path(xlsx_path).stat()
     existing = conn.execute(
-        "SELECT id FROM export_history WHERE file_hash = ?", [fhash]
+        "SELECT file_hash FROM export_history "
+        "WHERE file_path = ? AND file_size = ? AND file_mtime = ? LIMIT 1",
+        [xlsx_path, st.st_size, st.st_mtime],
     ).fetchone()
+    if existing:
+        fhash = existing[0]
+    else:
+        # Compute file hash for dedup
+        fhash = _file_hash(xlsx_path)
+        existing = conn.execute(
+            "SELECT id FROM export_history WHERE file_hash = ?", [fhash]
+        ).fetchone()
     if existing:
         logger.info("File already imported (hash=%s), skipping", fhash)
-        conn.close()
         return {
             "export_type": export_type or "unknown",
             "rows_imported": 0,
@@ -536,18 +701,25 @@ def ingest_xlsx(
             "skipped": True,
         }
 
-    # Detect bulk vs single-sheet export
-    if export_type is None and _is_bulk_export(xlsx_path):
-        logger.info("Detected bulk (all-time) export — processing multiple sheets")
-        sheet_stats = _ingest_bulk(conn, xlsx_path)
-        total_rows = sum(sheet_stats.values())
+    # Open the workbook once; bulk detection and every sheet read share it.
+    with _open_workbook(xlsx_path) as book:
+        bulk = export_type is None and _is_bulk_export(book.sheet_names)
+        if bulk:
+            logger.info("Detected bulk (all-time) export — processing multiple sheets")
+            # All sheets and the history row commit together, or not at all.
+            with _transaction(conn):
+                sheet_stats = _ingest_bulk(conn, book, Path(xlsx_path).name)
+                total_rows = sum(sheet_stats.values())
+                conn.execute(
+                    "INSERT INTO export_history "
+                    "(export_type, file_path, file_hash, rows_imported, file_size, file_mtime) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ["bulk", xlsx_path, fhash, total_rows, st.st_size, st.st_mtime],
+                )
+        else:
+            df = _normalize_columns(book.parse(0))
 
-        conn.execute(
-            "INSERT INTO export_history (export_type, file_path, file_hash, rows_imported) "
-            "VALUES (?, ?, ?, ?)",
-            ["bulk", xlsx_path, fhash, total_rows],
-        )
-        conn.close()
+    if bulk:
         logger.info("Bulk ingestion complete: %s", sheet_stats)
 
         if archive_dir:
@@ -563,13 +735,10 @@ def ingest_xlsx(
         }
 
     # Single-sheet export path
-    df = pd.read_excel(xlsx_path, engine="openpyxl")
-    df = _normalize_columns(df)
     logger.info("Read %d rows and %d columns from %s", len(df), len(df.columns), xlsx_path)
 
     if df.empty:
         logger.warning("Empty spreadsheet: %s", xlsx_path)
-        conn.close()
         return {
             "export_type": export_type or "unknown",
             "rows_imported": 0,
@@ -596,18 +765,19 @@ def ingest_xlsx(
         "summary": _prepare_summary,
     }
     source = Path(xlsx_path).name
-    staging_df = preparers[etype](df, source)
+    staging_df = _coerce_types(preparers[etype](df, source))
 
-    rows_imported = _upsert_df(conn, staging_df, etype, source)
+    with _transaction(conn):
+        rows_imported = _upsert_df(conn, staging_df, etype, source)
 
-    # Record in export history
-    conn.execute(
-        "INSERT INTO export_history (export_type, file_path, file_hash, rows_imported) "
-        "VALUES (?, ?, ?, ?)",
-        [etype, xlsx_path, fhash, rows_imported],
-    )
+        # Record in export history
+        conn.execute(
+            "INSERT INTO export_history "
+            "(export_type, file_path, file_hash, rows_imported, file_size, file_mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [etype, xlsx_path, fhash, rows_imported, st.st_size, st.st_mtime],
+        )
 
-    conn.close()
     logger.info("Ingestion complete: %d rows into %s", rows_imported, etype)
 
     if archive_dir:
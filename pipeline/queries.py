@@ -15,13 +15,26 @@ logger = logging.getLogger(__name__)
 def _rows_to_dicts(result: duckdb.DuckDBPyRelation | None) -> list[dict]:
     """Convert a DuckDB query result to a list of dicts.
 
-    Handles the case where the result is ``None`` (no rows) by returning
-    an empty list.
+    ``DATE`` columns (found once from the result description) are returned
+    as ISO ``YYYY-MM-DD`` strings for JSON.  Handles the case where the
+    result is ``None`` (no rows) by returning an empty list.
     """
     if result is None:
         return []
     columns = [desc[0] for desc in result.description]
-    return [dict(zip(columns, row)) for row in result.fetchall()]
+    date_cols = [i for i, desc in enumerate(result.description) if str(desc[1]) == "DATE"]
+    rows = result.fetchall()
+    if not date_cols:
+        return [dict(zip(columns, row)) for row in rows]
+
+    out = []
+    for row in rows:
+        values = list(row)
+        for i in date_cols:
+            if values[i] is not None:
+                values[i] = values[i].isoformat()
+        out.append(dict(zip(columns, values)))
+    return out
 
 
 # ---------------------------------------------------------------------------
@@ -43,13 +56,7 @@ def get_daily_summary(db: duckdb.DuckDBPyConnection, date_str: str) -> dict:
         "SELECT * FROM daily_summary WHERE date = ? LIMIT 1", [date_str]
     )
     rows = _rows_to_dicts(result)
-    if rows:
-        row = rows[0]
-        # Stringify date for JSON
-        if isinstance(row.get("date"), date):
-            row["date"] = row["date"].isoformat()
-        return row
-    return {}
+    return rows[0] if rows else {}
 
 
 def get_nutrition_log(db: duckdb.DuckDBPyConnection, date_str: str) -> list[dict]:
@@ -66,11 +73,7 @@ def get_nutrition_log(db: duckdb.DuckDBPyConnection, date_str: str) -> list[dict
         "SELECT * FROM nutrition_log WHERE date = ? ORDER BY meal, food_name",
         [date_str],
     )
-    rows = _rows_to_dicts(result)
-    for row in rows:
-        if isinstance(row.get("date"), date):
-            row["date"] = row["date"].isoformat()
-    return rows
+    return _rows_to_dicts(result)
 
 
 def get_workouts(
@@ -93,11 +96,7 @@ def get_workouts(
         "ORDER BY date, exercise_name, set_number",
         [start_date, end_date],
     )
-    rows = _rows_to_dicts(result)
-    for row in rows:
-        if isinstance(row.get("date"), date):
-            row["date"] = row["date"].isoformat()
-    return rows
+    return _rows_to_dicts(result)
 
 
 def get_weight_trend(
@@ -117,11 +116,7 @@ def get_weight_trend(
     result = db.execute(
         "SELECT * FROM weight_log WHERE date >= ? ORDER BY date ASC", [start]
     )
-    rows = _rows_to_dicts(result)
-    for row in rows:
-        if isinstance(row.get("date"), date):
-            row["date"] = row["date"].isoformat()
-    return rows
+    return _rows_to_dicts(result)
 
 
 def get_macro_adherence(
@@ -197,33 +192,29 @@ def get_recent_prs(
     start = (date.today() - timedelta(days=days)).isoformat()
     result = db.execute(
         """
-        WITH ranked AS (
+        WITH best AS (
+            -- arg_max keeps the heaviest set (most reps on ties, NULL reps
+            -- last) in a hash aggregate, without sorting each exercise.
             SELECT
                 exercise_name,
-                weight_kg,
-                reps,
-                date,
-                ROW_NUMBER() OVER (
-                    PARTITION BY exercise_name
-                    ORDER BY weight_kg DESC, reps DESC
-                ) AS rn
+                max(weight_kg) AS max_weight_kg,
+                arg_max(
+                    {'reps': reps, 'date': date},
+                    (weight_kg, coalesce(reps, -1))
+                ) AS pr
             FROM workouts
             WHERE date >= ?
               AND weight_kg IS NOT NULL
+            GROUP BY exercise_name
         )
         SELECT
             exercise_name,
-            weight_kg   AS max_weight_kg,
-            reps         AS reps_at_max,
-            date
-        FROM ranked
-        WHERE rn = 1
+            max_weight_kg,
+            pr.reps      AS reps_at_max,
+            pr.date      AS date
+        FROM best
         ORDER BY max_weight_kg DESC
         """,
         [start],
     )
-    rows = _rows_to_dicts(result)
-    for row in rows:
-        if isinstance(row.get("date"), date):
-            row["date"] = row["date"].isoformat()
-    return rows
+    return _rows_to_dicts(result)
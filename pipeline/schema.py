@@ -84,30 +84,54 @@ CREATE TABLE IF NOT EXISTS export_history (
     file_path       TEXT NOT NULL,
     file_hash       TEXT NOT NULL,
     rows_imported   INTEGER DEFAULT 0,
-    imported_at     TIMESTAMP DEFAULT current_timestamp
+    imported_at     TIMESTAMP DEFAULT current_timestamp,
+    file_size       BIGINT,
+    file_mtime      DOUBLE
 );
 """
 
+# Columns added after the first release; brings older databases up to date.
+_MIGRATIONS = [
+    "ALTER TABLE export_history ADD COLUMN IF NOT EXISTS file_size BIGINT;",
+    "ALTER TABLE export_history ADD COLUMN IF NOT EXISTS file_mtime DOUBLE;",
+]
+
 _INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_nutrition_log_date ON nutrition_log (date);",
     "CREATE INDEX IF NOT EXISTS idx_workouts_date ON workouts (date);",
     "CREATE INDEX IF NOT EXISTS idx_weight_log_date ON weight_log (date);",
     "CREATE INDEX IF NOT EXISTS idx_daily_summary_date ON daily_summary (date);",
     "CREATE INDEX IF NOT EXISTS idx_export_history_hash ON export_history (file_hash);",
+    "CREATE INDEX IF NOT EXISTS idx_export_history_stat "
+    "ON export_history (file_path, file_size, file_mtime);",
 ]
 
 
+# Connection settings applied by init_db.  Every query that returns rows has
+# an ORDER BY, so inserts and scans need not preserve insertion order, which
+# lets DuckDB stream them without buffering.  Thread count and memory limit
+# are left at DuckDB's defaults (all cores, 80% of RAM).
+_DEFAULT_SETTINGS: dict[str, str] = {
+    "preserve_insertion_order": "false",
+}
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
-def init_db(db_path: str) -> duckdb.DuckDBPyConnection:
+def init_db(
+    db_path: str,
+    settings: dict[str, str] | None = None,
+) -> duckdb.DuckDBPyConnection:
     """Create or connect to the MacroClaw DuckDB database and ensure all tables exist.
 
     Args:
         db_path: Filesystem path for the DuckDB database file.
                  Parent directories are created automatically.
+        settings: DuckDB settings (e.g. ``{"memory_limit": "2GB"}``) applied on top
+                  of ``_DEFAULT_SETTINGS``.
 
     Returns:
         An open ``duckdb.DuckDBPyConnection`` ready for use.
@@ -118,6 +142,8 @@ def init_db(db_path: str) -> duckdb.DuckDBPyConnection:
 
     logger.info("Connecting to database at %s", db_path)
     conn = duckdb.connect(db_path)
+    for name, value in {**_DEFAULT_SETTINGS, **(settings or {})}.items():
+        conn.execute(f"SET {name} = '{value}'")
 
     for ddl in [
         _CREATE_NUTRITION_LOG,
@@ -128,6 +154,9 @@ def init_db(db_path: str) -> duckdb.DuckDBPyConnection:
     ]:
         conn.execute(ddl)
 
+    for stmt in _MIGRATIONS:
+        conn.execute(stmt)
+
     for idx in _INDEXES:
         conn.execute(idx)
 
@@ -6,27 +6,89 @@ or perform a one-shot scan.
 """
 
 import logging
+import threading
 import time
 from pathlib import Path
 
+import duckdb
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
 from watchdog.observers import Observer
 
 from pipeline.ingest import ingest_xlsx
+from pipeline.schema import init_db
 
 logger = logging.getLogger(__name__)
 
+# Quiet period after the last file event before pending files are ingested.
+# Lets a file finish writing and gathers a burst of exports into one pass.
+DEBOUNCE_SECONDS = 0.5
+
+
+def _wait_for_stable(
+    path: str,
+    interval: float = 0.05,
+    stable_for: float = 0.1,
+    timeout: float = 5.0,
+) -> bool:
+    """Block until *path* stops growing, i.e. its writer has finished.
+
+    Args:
+        path: File to watch.
+        interval: Delay between size checks.
+        stable_for: How long the size must stay unchanged.
+        timeout: Upper bound on the time spent waiting.
+
+    Returns:
+        ``True`` once the size has held steady, ``False`` if the file vanished
+        or was still changing after *timeout* seconds.
+    """
+    deadline = time.monotonic() + timeout
+    last = -1
+    steady_since = None
+    while time.monotonic() < deadline:
+        try:
+            size = Path(path).stat().st_size
+        except FileNotFoundError:
+            return False
+        now = time.monotonic()
+        if size == last and size > 0:
+            steady_since = steady_since or now
+            if now - steady_since >= stable_for:
+                return True
+        else:
+            steady_since = None
+        last = size
+        time.sleep(interval)
+    return False
+
 
 class _XlsxHandler(FileSystemEventHandler):
-    """Watchdog handler that triggers ingestion on new .xlsx files."""
+    """Watchdog handler that triggers ingestion on new .xlsx files.
+
+    Events only record the path and re-arm a ``DEBOUNCE_SECONDS`` timer, so
+    the observer thread never sleeps; when the timer fires every pending file
+    is ingested in turn.  All ingests share *conn*; a lock keeps them from
+    overlapping on it.
+    """
 
-    def __init__(self, db_path: str, archive_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        archive_dir: str | None = None,
+        conn: duckdb.DuckDBPyConnection | None = None,
+    ) -> None:
         super().__init__()
         self.db_path = db_path
         self.archive_dir = archive_dir
-
-    def _process(self, path: str) -> None:
-        """Attempt to ingest a file if it is an .xlsx."""
+        self.conn = conn
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pending: dict[str, None] = {}
+        self._pending_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def _enqueue(self, path: str) -> None:
+        """Queue *path* if it is an .xlsx and restart the debounce timer."""
         if not path.lower().endswith(".xlsx"):
             return
         # macOS and some editors write temporary files; ignore those.
@@ -34,13 +96,54 @@ class _XlsxHandler(FileSystemEventHandler):
             logger.debug("Ignoring temporary file: %s", path)
             return
 
+        with self._pending_lock:
+            self._pending[path] = None
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(DEBOUNCE_SECONDS, self.drain)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def drain(self) -> None:
+        """Ingest every pending file now, cancelling any armed timer."""
+        with self._pending_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            paths = list(self._pending)
+            self._pending.clear()
+        for path in paths:
+            if _wait_for_stable(path):
+                self._process(path)
+            else:
+                logger.warning("Not ingesting %s: file vanished or is still being written", path)
+
+    def close(self) -> None:
+        """Ingest anything still pending, then stop using the shared connection.
+
+        Waits for an ingest already running on a fired timer to finish.  A
+        timer thread that reaches the connection afterwards leaves it alone
+        (its file stays in the imports directory for the next scan), so the
+        caller may close the connection once this returns.
+        """
+        self.drain()
+        with self._lock:
+            self._closed = True
+
+    def _process(self, path: str) -> None:
+        """Ingest *path* on the shared connection, logging the outcome."""
         logger.info("Detected new file: %s", path)
         try:
-            stats = ingest_xlsx(
-                db_path=self.db_path,
-                xlsx_path=path,
-                archive_dir=self.archive_dir,
-            )
+            with self._lock:
+                if self._closed:
+                    logger.warning("Watcher stopped; leaving %s for the next scan", path)
+                    return
+                stats = ingest_xlsx(
+                    db_path=self.db_path,
+                    xlsx_path=path,
+                    archive_dir=self.archive_dir,
+                    conn=self.conn,
+                )
             if stats["skipped"]:
                 logger.info("Skipped (duplicate): %s", path)
             else:
@@ -55,18 +158,18 @@ class _XlsxHandler(FileSystemEventHandler):
 
     def on_created(self, event: FileCreatedEvent) -> None:  # type: ignore[override]
         if not event.is_directory:
-            # Brief pause to let the file finish writing
-            time.sleep(0.5)
-            self._process(event.src_path)
+            self._enqueue(event.src_path)
 
     def on_moved(self, event: FileMovedEvent) -> None:  # type: ignore[override]
         if not event.is_directory:
-            time.sleep(0.5)
-            self._process(event.dest_path)
+            self._enqueue(event.dest_path)
 
 
 def _scan_existing(
-    imports_dir: str, db_path: str, archive_dir: str | None
+    imports_dir: str,
+    db_path: str,
+    archive_dir: str | None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> int:
     """One-shot scan: ingest any .xlsx files already in the imports directory.
 
@@ -84,6 +187,7 @@ def _scan_existing(
                 db_path=db_path,
                 xlsx_path=str(xlsx),
                 archive_dir=archive_dir,
+                conn=conn,
             )
             count += 1
         except Exception:
@@ -111,26 +215,33 @@ def watch(
     imports_dir = str(Path(imports_dir).expanduser().resolve())
     Path(imports_dir).mkdir(parents=True, exist_ok=True)
 
-    # Always process files that are already waiting
-    processed = _scan_existing(imports_dir, db_path, archive_dir)
-    logger.info("One-shot scan complete: processed %d file(s)", processed)
+    # One connection for the whole run, so schema setup happens once rather
+    # than per ingested file.
+    conn = init_db(db_path)
+    try:
+        # Always process files that are already waiting
+        processed = _scan_existing(imports_dir, db_path, archive_dir, conn)
+        logger.info("One-shot scan complete: processed %d file(s)", processed)
 
-    if one_shot:
-        return
+        if one_shot:
+            return
 
-    # Start long-running watcher
-    handler = _XlsxHandler(db_path=db_path, archive_dir=archive_dir)
-    observer = Observer()
-    observer.schedule(handler, imports_dir, recursive=False)
-    observer.start()
-    logger.info("Watching %s for new .xlsx files (Ctrl+C to stop)", imports_dir)
+        # Start long-running watcher
+        handler = _XlsxHandler(db_path=db_path, archive_dir=archive_dir, conn=conn)
+        observer = Observer()
+        observer.schedule(handler, imports_dir, recursive=False)
+        observer.start()
+        logger.info("Watching %s for new .xlsx files (Ctrl+C to stop)", imports_dir)
 
-    try:
-        while True:
-            time.sleep(poll_interval)
-    except KeyboardInterrupt:
-        logger.info("Stopping file watcher")
+        try:
+            while True:
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Stopping file watcher")
+        finally:
+            observer.stop()
+            observer.join()
+            handler.close()
+            logger.info("File watcher stopped")
     finally:
-        observer.stop()
-        observer.join()
-        logger.info("File watcher stopped")
+        conn.close()